@@ -10,7 +10,7 @@ country_to_region = {
     "FRA": "Europe", "DEU": "Europe", "GBR": "Europe", "ESP": "Europe", "ITA": "Europe", "ISL": "Europe", "NOR": "Europe", "SWE": "Europe",
     "USA": "North America", "CAN": "North America", "MEX": "North America",
     "CHN": "Asia", "IND": "Asia", "JPN": "Asia", "KOR": "Asia", "VNM": "Asia", "TUR": "Asia",
-    "BRA": "South America", "ARG": "North America", "CHL": "South America",
+    "BRA": "South America", "ARG": "South America", "CHL": "South America",
     "ZAF": "Africa", "EGY": "Africa", "NGA": "Africa", "KEN": "Africa", "MAR": "Africa", "GMB": "Africa",
     "AUS": "Oceania", "NZL": "Oceania"
 }
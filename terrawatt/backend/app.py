@@ -1,15 +1,36 @@
-from flask import Flask
+from flask import Flask, jsonify
 from flask_cors import CORS
 from routes.energy import energy_bp
 from routes.emissions import emissions_bp
 from routes.simulator import simulator_bp
+from routes.health import health_bp
+from routes.countries import countries_bp
+from routes.admin import admin_bp
+from utils.data_loader import start_background_load, get_load_status, DataNotReady
+from utils.admission import init_admission
 
 app = Flask(__name__)
 CORS(app, resources={r"/api/*": {"origins": "*"}})
 
+# Per-class concurrency pools and load shedding; stats at /api/health/admission
+init_admission(app)
+
 app.register_blueprint(energy_bp, url_prefix="/api")
 app.register_blueprint(emissions_bp, url_prefix="/api")
 app.register_blueprint(simulator_bp, url_prefix="/api")
+app.register_blueprint(health_bp, url_prefix="/api")
+app.register_blueprint(countries_bp, url_prefix="/api")
+
+@app.errorhandler(DataNotReady)
+def handle_data_not_ready(e):
+    # The dataset failed to load; answer fast instead of retrying the load per request
+    return jsonify(get_load_status()), 503
+
+# Operator-only endpoints; not under /api, so nginx does not proxy them
+app.register_blueprint(admin_bp, url_prefix="/admin")
+
+# Warm the data layer at import time; /api/health/ready flips once it is done
+start_background_load()
 
 if __name__ == "__main__":
     app.run(debug=False, port=5001, host='0.0.0.0', threaded=True)
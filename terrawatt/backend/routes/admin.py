@@ -0,0 +1,28 @@
+from flask import Blueprint, request, jsonify
+from utils.data_loader import get_memory_report, get_load_status, load_data
+
+# Mounted outside /api so the public proxy never forwards to it, and only
+# answered for direct loopback connections on the worker itself.
+admin_bp = Blueprint('admin', __name__)
+
+LOOPBACK_ADDRESSES = {"127.0.0.1", "::1"}
+
+@admin_bp.before_request
+def require_loopback():
+    proxied = request.headers.get('X-Forwarded-For') or request.headers.get('X-Real-IP')
+    if request.remote_addr not in LOOPBACK_ADDRESSES or proxied:
+        return jsonify({"error": "Forbidden"}), 403
+    return None
+
+@admin_bp.route('/memory', methods=['GET'])
+def get_memory():
+    return jsonify(get_memory_report())
+
+@admin_bp.route('/reload', methods=['POST'])
+def reload_data():
+    # Retries a failed load, e.g. after the CSVs have been fixed on disk
+    try:
+        load_data(reload=True)
+    except Exception:
+        return jsonify(get_load_status()), 503
+    return jsonify(get_load_status())
@@ -0,0 +1,26 @@
+from flask import Blueprint, request, jsonify
+from utils.data_loader import get_countries, resolve_country, search_countries
+
+countries_bp = Blueprint('countries', __name__)
+
+@countries_bp.route('/countries', methods=['GET'])
+def list_countries():
+    return jsonify(get_countries())
+
+@countries_bp.route('/countries/search', methods=['GET'])
+def search():
+    query = request.args.get('q', '')
+    limit = request.args.get('limit', 10)
+    try:
+        data = search_countries(query, limit)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(data)
+
+@countries_bp.route('/countries/<value>', methods=['GET'])
+def resolve(value):
+    try:
+        data = resolve_country(value)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    return jsonify(data)
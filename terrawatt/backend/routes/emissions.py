@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from utils.data_loader import get_emissions_data, get_emissions_comparison
+from utils.projection import parse_projection
 
 emissions_bp = Blueprint('emissions', __name__)
 
@@ -12,7 +13,11 @@ def get_country_emissions():
     if not country_code:
         return jsonify({"error": "country_code is required"}), 400
         
-    data = get_emissions_data(country_code, start_year, end_year)
+    try:
+        fields, layout = parse_projection(request.args)
+        data = get_emissions_data(country_code, start_year, end_year, fields, layout)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     return jsonify(data)
 
 @emissions_bp.route('/emissions/compare', methods=['GET'])
@@ -21,5 +26,9 @@ def get_emissions_compare():
     if not year:
         return jsonify({"error": "year is required"}), 400
         
-    data = get_emissions_comparison(year)
+    try:
+        fields, layout = parse_projection(request.args)
+        data = get_emissions_comparison(year, fields, layout)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     return jsonify(data)
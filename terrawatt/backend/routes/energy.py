@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify, Response
-from utils.data_loader import get_country_data, get_all_countries_for_year, get_renewable_pct, get_leaderboards, get_regional_aggregates, predict_trends, to_csv
+from utils.data_loader import get_country_data, get_all_countries_for_year, get_renewable_pct, get_leaderboards, get_regional_aggregates, predict_trends, to_csv, get_rankings, get_country_ranks, get_aggregate, get_similar_countries, get_deltas, get_distribution, get_groupings, get_series
+from utils.projection import parse_projection, shape_rows, shape_record, shape_groups
 
 energy_bp = Blueprint('energy', __name__)
 
@@ -13,7 +14,12 @@ def get_energy_mix():
     if not country_code:
         return jsonify({"error": "country_code is required"}), 400
         
-    data = get_country_data(country_code, start_year, end_year)
+    try:
+        fields, layout = parse_projection(request.args)
+        # CSV export is always row-oriented; only the field projection applies
+        data = get_country_data(country_code, start_year, end_year, fields, 'rows' if fmt == 'csv' else layout)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     
     if fmt == 'csv':
         csv_data = to_csv(data)
@@ -31,7 +37,11 @@ def get_energy_all():
     if not year:
         return jsonify({"error": "year is required"}), 400
         
-    data = get_all_countries_for_year(year)
+    try:
+        fields, layout = parse_projection(request.args)
+        data = get_all_countries_for_year(year, fields, layout)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     return jsonify(data)
 
 @energy_bp.route('/energy/renewable-pct', methods=['GET'])
@@ -40,19 +50,32 @@ def get_renewable_percentage():
     if not year:
         return jsonify({"error": "year is required"}), 400
         
-    data = get_renewable_pct(year)
+    try:
+        fields, layout = parse_projection(request.args)
+        data = shape_rows(get_renewable_pct(year, request.args.get('key', 'code')), fields, layout)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     return jsonify(data)
 
 @energy_bp.route('/energy/leaderboard', methods=['GET'])
 def get_leaderboard():
     year = request.args.get('year', 2024)
-    data = get_leaderboards(year)
+    try:
+        fields, layout = parse_projection(request.args)
+        data = shape_groups(get_leaderboards(year), fields, layout)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     return jsonify(data)
 
 @energy_bp.route('/energy/regional', methods=['GET'])
 def get_regional():
     year = request.args.get('year', 2024)
-    data = get_regional_aggregates(year)
+    grouping = request.args.get('grouping', 'region')
+    try:
+        fields, layout = parse_projection(request.args)
+        data = shape_rows(get_regional_aggregates(year, grouping), fields, layout)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     return jsonify(data)
 
 @energy_bp.route('/energy/predict', methods=['GET'])
@@ -60,5 +83,123 @@ def get_prediction():
     country_code = request.args.get('country_code')
     if not country_code:
         return jsonify({"error": "country_code is required"}), 400
-    data = predict_trends(country_code)
+    try:
+        fields, layout = parse_projection(request.args)
+        data = shape_rows(predict_trends(country_code), fields, layout)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(data)
+
+@energy_bp.route('/energy/rank', methods=['GET'])
+def get_rank():
+    metric = request.args.get('metric')
+    year = request.args.get('year', 2024)
+    k = request.args.get('k', 10)
+    order = request.args.get('order', 'desc')
+    region = request.args.get('region')
+    if not metric:
+        return jsonify({"error": "metric is required"}), 400
+    try:
+        fields, layout = parse_projection(request.args)
+        data = shape_rows(get_rankings(metric, year, k, order, region), fields, layout)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(data)
+
+@energy_bp.route('/energy/rank/country', methods=['GET'])
+def get_country_rank():
+    country_code = request.args.get('country_code')
+    year = request.args.get('year', 2024)
+    metrics = request.args.get('metrics')
+    if not country_code:
+        return jsonify({"error": "country_code is required"}), 400
+    try:
+        fields, layout = parse_projection(request.args)
+        ranks = get_country_ranks(country_code, year, metrics.split(',') if metrics else None)
+        data = {metric: shape_record(rank, fields, layout) for metric, rank in ranks.items()}
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(data)
+
+@energy_bp.route('/aggregate', methods=['GET'])
+def get_range_aggregate():
+    entity = request.args.get('entity', 'all')
+    metric = request.args.get('metric')
+    start_year = request.args.get('start_year', 2000)
+    end_year = request.args.get('end_year', 2024)
+    op = request.args.get('op', 'sum')
+    grouping = request.args.get('grouping')
+    if not metric:
+        return jsonify({"error": "metric is required"}), 400
+    try:
+        fields, layout = parse_projection(request.args)
+        data = shape_rows(get_aggregate(entity, metric, start_year, end_year, op, grouping), fields, layout)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(data)
+
+@energy_bp.route('/energy/similar', methods=['GET'])
+def get_similar():
+    country_code = request.args.get('country_code')
+    year = request.args.get('year', 2024)
+    target_year = request.args.get('target_year')
+    k = request.args.get('k', 5)
+    features = request.args.get('features')
+    if not country_code:
+        return jsonify({"error": "country_code is required"}), 400
+    try:
+        fields, layout = parse_projection(request.args)
+        data = shape_rows(get_similar_countries(country_code, year, target_year, k, features.split(',') if features else None), fields, layout)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(data)
+
+@energy_bp.route('/energy/delta', methods=['GET'])
+def get_delta():
+    from_year = request.args.get('from_year')
+    to_year = request.args.get('to_year', 2024)
+    metrics = request.args.get('metrics')
+    if not from_year:
+        return jsonify({"error": "from_year is required"}), 400
+    try:
+        fields, layout = parse_projection(request.args)
+        data = shape_rows(get_deltas(from_year, to_year, metrics.split(',') if metrics else None), fields, layout)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(data)
+
+@energy_bp.route('/energy/distribution', methods=['GET'])
+def get_metric_distribution():
+    metric = request.args.get('metric')
+    year = request.args.get('year')
+    if not metric:
+        return jsonify({"error": "metric is required"}), 400
+    try:
+        data = get_distribution(metric, None if year in (None, '', 'all') else year)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(data)
+
+@energy_bp.route('/energy/groups', methods=['GET'])
+def get_groups():
+    return jsonify(get_groupings())
+
+@energy_bp.route('/energy/series', methods=['GET'])
+def get_energy_series():
+    country_code = request.args.get('country_code')
+    metric = request.args.get('metric')
+    if not country_code or not metric:
+        return jsonify({"error": "country_code and metric are required"}), 400
+
+    try:
+        data = get_series(
+            country_code, metric,
+            start=request.args.get('start'),
+            end=request.args.get('end'),
+            resolution=request.args.get('resolution', 'annual'),
+            points=request.args.get('points', 500),
+            method=request.args.get('method', 'lttb')
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     return jsonify(data)
@@ -0,0 +1,28 @@
+from flask import Blueprint, jsonify
+from utils.data_loader import get_load_status, get_validation_report
+from utils.admission import get_admission_stats
+
+health_bp = Blueprint('health', __name__)
+
+@health_bp.route('/health/live', methods=['GET'])
+def get_liveness():
+    return jsonify({"status": "ok"})
+
+@health_bp.route('/health/ready', methods=['GET'])
+def get_readiness():
+    # 503 until the data layer has finished loading, so proxies skip cold workers
+    status = get_load_status()
+    if status["status"] != "ready":
+        return jsonify(status), 503
+    return jsonify(status)
+
+@health_bp.route('/health/validation', methods=['GET'])
+def get_validation():
+    report = get_validation_report()
+    if report is None:
+        return jsonify({"status": "loading"}), 503
+    return jsonify(report), 200 if report["ok"] else 503
+
+@health_bp.route('/health/admission', methods=['GET'])
+def get_admission():
+    return jsonify(get_admission_stats())
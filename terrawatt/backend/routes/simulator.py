@@ -1,20 +1,10 @@
-from flask import Blueprint, request, jsonify
-from utils.data_loader import get_country_data, get_emissions_data
+import json
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from utils.data_loader import get_country_data, get_emissions_data, DataNotReady
+from utils.simulation import EMISSIONS_FACTORS, build_result, create_session, get_session, close_session
 
 simulator_bp = Blueprint('simulator', __name__)
 
-# Emissions factors (g CO2/kWh) - approximate
-EMISSIONS_FACTORS = {
-    "coal_pct": 820,
-    "oil_pct": 720,
-    "gas_pct": 490,
-    "nuclear_pct": 12,
-    "hydro_pct": 24,
-    "wind_pct": 11,
-    "solar_pct": 45,
-    "other_renewables_pct": 38
-}
-
 @simulator_bp.route('/simulate', methods=['POST'])
 def simulate_grid():
     try:
@@ -84,38 +74,92 @@ def simulate_grid():
         # Let's scale the per_kwh to reflect the mix accurately.
         # co2_per_kwh = (sum(pct * factor)) / sum(pct)
         
-        if total_pct > 0:
-            new_co2_per_kwh = new_weighted_sum / total_pct
-        else:
-            new_co2_per_kwh = 0
-            
-        # Calculate new total emissions
-        # Original: emissions_mt = (total_gen_twh * 1e9 * original_co2_kwh) / 1e12
-        # We keep total_generation_twh constant (assumption: demand doesn't change, just mix).
-        
-        total_gen_twh = original_energy['total_generation_twh']
-        new_emissions_mt = (total_gen_twh * 1e9 * new_co2_per_kwh) / 1e12
-        
-        result = {
-            "country_code": country_code,
-            "base_year": base_year,
-            "original": {
-                "co2_emissions_mt": original_emissions['co2_emissions_mt'],
-                "co2_per_kwh": original_emissions['co2_per_kwh'],
-                "energy_mix": {k: original_energy[k] for k in EMISSIONS_FACTORS.keys()}
-            },
-            "simulated": {
-                "co2_emissions_mt": round(new_emissions_mt, 2),
-                "co2_per_kwh": round(new_co2_per_kwh, 2),
-                "energy_mix": {k: simulated_mix[k] for k in EMISSIONS_FACTORS.keys()}
-            },
-            "delta": {
-                "co2_saved_mt": round(original_emissions['co2_emissions_mt'] - new_emissions_mt, 2),
-                "co2_per_kwh_reduction": round(original_emissions['co2_per_kwh'] - new_co2_per_kwh, 2)
-            }
-        }
+        result = build_result(
+            country_code, base_year, original_energy, original_emissions,
+            simulated_mix, new_weighted_sum, total_pct
+        )
         
         return jsonify(result)
 
+    except DataNotReady:
+        raise
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+# Seconds between SSE comment frames; also how quickly a dropped client is noticed
+STREAM_KEEPALIVE_SECONDS = 15
+
+@simulator_bp.route('/simulate/session', methods=['POST'])
+def open_simulation_session():
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+    country_code = data.get('country_code')
+    if not country_code:
+        return jsonify({"error": "country_code is required"}), 400
+    try:
+        base_year = int(data.get('base_year', 2024))
+    except (ValueError, TypeError):
+        return jsonify({"error": "base_year must be an integer"}), 400
+
+    # Base rows are looked up once and pinned on the session
+    original_energy_list = get_country_data(country_code, base_year, base_year)
+    if not original_energy_list:
+        return jsonify({"error": "Data not found for country/year"}), 404
+    original_emissions_list = get_emissions_data(country_code, base_year, base_year)
+    original_emissions = original_emissions_list[0] if original_emissions_list else {"co2_emissions_mt": 0, "co2_per_kwh": 0}
+
+    session = create_session(country_code, base_year, original_energy_list[0], original_emissions)
+    return jsonify(session.snapshot()), 201
+
+@simulator_bp.route('/simulate/session/<session_id>', methods=['POST'])
+def update_simulation_session(session_id):
+    session = get_session(session_id)
+    if session is None:
+        return jsonify({"error": "Unknown or expired session"}), 404
+
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+    try:
+        version = session.update(set_values=data.get('set'), adjust=data.get('adjust'))
+    except (ValueError, TypeError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    # Clients listening on the stream only need an ack; everyone else gets the result inline
+    if data.get('reply', True) is False:
+        return jsonify({"session_id": session_id, "version": version}), 202
+    return jsonify(session.snapshot())
+
+@simulator_bp.route('/simulate/session/<session_id>/stream', methods=['GET'])
+def stream_simulation_session(session_id):
+    session = get_session(session_id)
+    if session is None:
+        return jsonify({"error": "Unknown or expired session"}), 404
+
+    def events():
+        seen = -1
+        while not session.closed:
+            version = session.wait_for_change(seen, STREAM_KEEPALIVE_SECONDS)
+            if session.closed:
+                break
+            if version == seen:
+                yield ": keepalive\n\n"
+                continue
+            # Always push the latest state; intermediate versions are coalesced away
+            snapshot = session.snapshot()
+            seen = snapshot["version"]
+            yield f"event: result\nid: {seen}\ndata: {json.dumps(snapshot)}\n\n"
+        yield "event: closed\ndata: {}\n\n"
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@simulator_bp.route('/simulate/session/<session_id>', methods=['DELETE'])
+def delete_simulation_session(session_id):
+    if not close_session(session_id):
+        return jsonify({"error": "Unknown or expired session"}), 404
+    return jsonify({"session_id": session_id, "closed": True})
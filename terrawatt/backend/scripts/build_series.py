@@ -0,0 +1,52 @@
+"""
+Convert a long-format sub-annual CSV into the time-partitioned layout the
+API serves from data/series.
+
+Usage: python scripts/build_series.py <input.csv> <monthly|hourly> [output_dir]
+
+The input needs a country_code column, a timestamp column (anything pandas
+can parse; naive times are taken as UTC) and one column per metric. The
+CSV is parsed in chunks and kept as float32 arrays per country until the
+partitions are written, so pandas never holds the whole file.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(SCRIPT_DIR, '..'))
+
+from utils.timeseries import write_partitions
+
+CHUNK_ROWS = 1_000_000
+
+
+def main():
+    if len(sys.argv) < 3:
+        print(__doc__.strip(), file=sys.stderr)
+        sys.exit(2)
+    source, resolution = sys.argv[1], sys.argv[2]
+    output = sys.argv[3] if len(sys.argv) > 3 else os.path.join(SCRIPT_DIR, '..', 'data', 'series')
+
+    parts = {}
+    for chunk in pd.read_csv(source, chunksize=CHUNK_ROWS):
+        times = pd.to_datetime(chunk['timestamp'], utc=True).astype('int64') // 10**9
+        metrics = [c for c in chunk.columns if c not in ('country_code', 'timestamp', 'country', 'region')]
+        chunk = chunk.assign(_time=times.to_numpy())
+        for code, rows in chunk.groupby('country_code'):
+            parts.setdefault(code, []).append(
+                (rows['_time'].to_numpy(), {m: rows[m].to_numpy(dtype=np.float32) for m in metrics})
+            )
+
+    for code, pieces in parts.items():
+        time = np.concatenate([t for t, _ in pieces])
+        columns = {m: np.concatenate([cols[m] for _, cols in pieces]) for m in pieces[0][1]}
+        write_partitions(output, resolution, code, time, columns)
+        print(f"{code}: {len(time)} rows")
+
+
+if __name__ == "__main__":
+    main()
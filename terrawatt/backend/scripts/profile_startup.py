@@ -0,0 +1,79 @@
+"""
+Compare worker cold-start cost of the NumPy serving core against the old
+pandas-based loader.
+
+Each variant runs in a fresh interpreter so import time and peak RSS are
+not shared. The pandas variant reproduces what the API used to do at
+startup: import pandas and read both CSVs into DataFrames.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.join(SCRIPT_DIR, '..')
+
+CORE_PROBE = """
+import json, time
+started = time.perf_counter()
+from utils import data_loader
+data_loader.load_data()
+elapsed = time.perf_counter() - started
+stats = data_loader.get_process_stats()
+stats["total_ms"] = round(elapsed * 1000, 2)
+print(json.dumps(stats))
+"""
+
+PANDAS_PROBE = """
+import json, os, resource, sys, time
+started = time.perf_counter()
+import pandas as pd
+import_ms = (time.perf_counter() - started) * 1000
+data_dir = os.path.join('data')
+pd.read_csv(os.path.join(data_dir, 'energy_mix.csv'))
+pd.read_csv(os.path.join(data_dir, 'co2_emissions.csv'))
+elapsed = time.perf_counter() - started
+max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == 'darwin':
+    max_rss //= 1024
+print(json.dumps({
+    "import_ms": round(import_ms, 2),
+    "total_ms": round(elapsed * 1000, 2),
+    "max_rss_mb": round(max_rss / 1024, 1),
+}))
+"""
+
+
+def run_probe(code):
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    results = {}
+    for label, code in (("numpy core", CORE_PROBE), ("pandas loader", PANDAS_PROBE)):
+        samples = [run_probe(code) for _ in range(runs)]
+        # Best of N: the floor is the least noisy estimate of cold-start cost
+        results[label] = {
+            key: min(s[key] for s in samples)
+            for key in ("import_ms", "total_ms", "max_rss_mb")
+        }
+
+    for label, stats in results.items():
+        print(f"{label:14s} import={stats['import_ms']:8.1f}ms  "
+              f"startup={stats['total_ms']:8.1f}ms  rss={stats['max_rss_mb']:6.1f}MB")
+
+    core, legacy = results["numpy core"], results["pandas loader"]
+    print(f"\nSaved {legacy['total_ms'] - core['total_ms']:.1f}ms startup "
+          f"and {legacy['max_rss_mb'] - core['max_rss_mb']:.1f}MB peak RSS per worker")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,10 +9,14 @@ countries and realistic estimates for the rest, with smooth 2000-2024 trends.
 
 import os
 import shutil
+import sys
 import numpy as np
 import pandas as pd
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(SCRIPT_DIR, '..'))
+
+from utils.validation import validate_tables
 DATA_DIR = os.path.join(SCRIPT_DIR, '..', 'data')
 
 ENERGY_MIX_PATH = os.path.join(DATA_DIR, 'energy_mix.csv')
@@ -475,36 +479,19 @@ def calculate_emissions(df_energy):
 
 
 def validate(df_energy, df_emissions):
-    """Validate the regenerated data."""
+    """
+    Validate the regenerated data with the same checks the API runs at load
+    time. Returns the report (report["ok"] is False when an error-level check
+    fails) and one readable line per failing check.
+    """
+    report = validate_tables(df_energy, df_emissions)
     issues = []
-    n_countries = df_energy["country_code"].nunique()
-
-    if len(df_energy) != n_countries * NUM_YEARS:
-        issues.append(f"Energy row count: {len(df_energy)} (expected {n_countries * NUM_YEARS})")
-    if len(df_emissions) != n_countries * NUM_YEARS:
-        issues.append(f"Emissions row count: {len(df_emissions)} (expected {n_countries * NUM_YEARS})")
-
-    for col in MIX_COLS + ["total_generation_twh"]:
-        if (df_energy[col] < -0.01).any():
-            issues.append(f"Negative values in {col}")
-
-    # Check percentage sums
-    pct_sums = df_energy[MIX_COLS].sum(axis=1)
-    bad = (pct_sums - 100).abs() > 0.15
-    if bad.any():
-        n_bad = bad.sum()
-        issues.append(f"{n_bad} rows where mix doesn't sum to 100")
-
-    # Check smoothness (skip micro-countries where rounding dominates)
-    for code, grp in df_energy.groupby("country_code"):
-        series = grp.sort_values("year")["total_generation_twh"].values
-        if np.mean(series) < 0.1:
-            continue  # too small for meaningful smoothness check
-        deltas = np.diff(series)
-        if np.std(deltas) > np.mean(series) * 0.1:
-            issues.append(f"{code}: generation too volatile")
-
-    return issues
+    for name, check in report["checks"].items():
+        if check["ok"]:
+            continue
+        where = ", ".join(f"{e['country_code']} {e['year']}" for e in check["examples"])
+        issues.append(f"{name} ({check['severity']}): {check['failures']} failing rows, e.g. {where}")
+    return report, issues
 
 
 def main():
@@ -537,7 +524,7 @@ def main():
     df_emissions = calculate_emissions(df_energy)
 
     print("Validating...")
-    issues = validate(df_energy, df_emissions)
+    report, issues = validate(df_energy, df_emissions)
     if issues:
         print(f"\n{len(issues)} issues:")
         for issue in issues[:30]:
@@ -564,6 +551,11 @@ def main():
               f"coal={row_2000['coal_pct']:.1f}% CO2={em_2000['co2_emissions_mt']:.1f}MT "
               f"({em_2000['co2_per_kwh']:.0f}g/kWh)")
 
+    # The API refuses a dataset with error-level failures, so never write one
+    if not report["ok"]:
+        print(f"\nRefusing to write: error checks failed ({', '.join(report['errors'])})", file=sys.stderr)
+        sys.exit(1)
+
     # Backup & write
     print("\nBacking up originals...")
     for path in [ENERGY_MIX_PATH, EMISSIONS_PATH]:
@@ -0,0 +1,40 @@
+"""
+Validate energy_mix.csv and co2_emissions.csv with the same checks the API
+runs before serving them, and write a machine-readable JSON report.
+
+Usage: python scripts/validate_data.py [report.json]
+
+Exits non-zero when any error-level check fails, so it can gate a data
+refresh or a deploy.
+"""
+
+import json
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(SCRIPT_DIR, '..'))
+
+from utils.data_loader import read_dataset
+from utils.validation import validate_tables
+
+
+def main():
+    energy, emissions = read_dataset()
+    report = validate_tables(energy, emissions)
+    output = json.dumps(report, indent=2)
+
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'w') as f:
+            f.write(output + "\n")
+        print(f"Wrote {sys.argv[1]}")
+    else:
+        print(output)
+
+    status = "passed" if report["ok"] else f"FAILED ({', '.join(report['errors'])})"
+    print(f"Validation {status}; warnings: {', '.join(report['warnings']) or 'none'}", file=sys.stderr)
+    sys.exit(0 if report["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import math
+import threading
+import time
+from flask import request, jsonify, g
+
+class Pool:
+    """Bounded concurrency, a bounded wait queue and a queue deadline for one endpoint class."""
+
+    def __init__(self, name, priority, concurrency, queue_limit, deadline_seconds):
+        self.name = name
+        self.priority = priority
+        self.concurrency = concurrency
+        self.queue_limit = queue_limit
+        self.deadline_seconds = deadline_seconds
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.shed_queue_full = 0
+        self.shed_deadline = 0
+        self.wait_seconds = 0.0
+
+    def stats(self):
+        return {
+            "priority": self.priority,
+            "concurrency": self.concurrency,
+            "queue_limit": self.queue_limit,
+            "deadline_seconds": self.deadline_seconds,
+            "active": self.active,
+            "queued": self.waiting,
+            "admitted": self.admitted,
+            "shed_queue_full": self.shed_queue_full,
+            "shed_deadline": self.shed_deadline,
+            "mean_wait_ms": round(self.wait_seconds / self.admitted * 1000, 3) if self.admitted else 0.0
+        }
+
+# Lower priority number runs first. Cheap reads (map, leaderboard, lookups)
+# never wait behind simulations or exports; SSE streams hold a slot for their
+# whole lifetime, so they get their own pool and are never queued.
+POOLS = [
+    Pool("interactive", priority=0, concurrency=16, queue_limit=64, deadline_seconds=2.0),
+    Pool("heavy", priority=1, concurrency=4, queue_limit=16, deadline_seconds=5.0),
+    Pool("stream", priority=2, concurrency=64, queue_limit=0, deadline_seconds=0.0),
+]
+
+ENDPOINT_CLASSES = {
+    "simulator.simulate_grid": "heavy",
+    "energy.get_energy_series": "heavy",
+    "simulator.stream_simulation_session": "stream",
+}
+EXEMPT_BLUEPRINTS = {"health", "admin"}
+
+class Overloaded(Exception):
+    def __init__(self, pool, reason):
+        super().__init__(f"{pool.name} queue {reason}")
+        self.pool = pool
+        self.reason = reason
+        self.retry_after = max(1, math.ceil(pool.deadline_seconds))
+
+class Scheduler:
+    """
+    Admits requests into per-class pools under one condition variable. A
+    request waits only while its pool is full or a higher-priority class has
+    requests queued, and is shed with Overloaded when its queue is full or
+    its deadline passes while waiting.
+    """
+
+    def __init__(self, pools):
+        self.pools = {pool.name: pool for pool in pools}
+        self.changed = threading.Condition()
+
+    def _can_run(self, pool):
+        if pool.active >= pool.concurrency:
+            return False
+        return not any(p.waiting for p in self.pools.values() if p.priority < pool.priority)
+
+    def acquire(self, name):
+        pool = self.pools[name]
+        with self.changed:
+            if pool.waiting == 0 and self._can_run(pool):
+                pool.active += 1
+                pool.admitted += 1
+                return pool
+            if pool.waiting >= pool.queue_limit:
+                pool.shed_queue_full += 1
+                raise Overloaded(pool, "full")
+
+            started = time.monotonic()
+            pool.waiting += 1
+            try:
+                admitted = self.changed.wait_for(lambda: self._can_run(pool), pool.deadline_seconds)
+            finally:
+                pool.waiting -= 1
+                # A waiter leaving can unblock lower-priority classes
+                self.changed.notify_all()
+            if not admitted:
+                pool.shed_deadline += 1
+                raise Overloaded(pool, "deadline exceeded")
+            pool.active += 1
+            pool.admitted += 1
+            pool.wait_seconds += time.monotonic() - started
+            return pool
+
+    def release(self, pool):
+        with self.changed:
+            pool.active -= 1
+            self.changed.notify_all()
+
+    def stats(self):
+        with self.changed:
+            return {name: pool.stats() for name, pool in self.pools.items()}
+
+_scheduler = Scheduler(POOLS)
+
+def classify(req):
+    """Endpoint class for a request, or None for requests that bypass admission."""
+    if req.method == 'OPTIONS' or req.endpoint is None or req.blueprint in EXEMPT_BLUEPRINTS:
+        return None
+    if req.args.get('format') == 'csv':
+        return "heavy"
+    return ENDPOINT_CLASSES.get(req.endpoint, "interactive")
+
+def get_admission_stats():
+    return _scheduler.stats()
+
+def init_admission(app):
+    """Puts the scheduler in front of every blueprint."""
+
+    @app.before_request
+    def _admit():
+        name = classify(request)
+        if name is None:
+            return None
+        try:
+            g.admission_pool = _scheduler.acquire(name)
+        except Overloaded as e:
+            response = jsonify({"error": "Server busy, retry later", "class": e.pool.name, "reason": e.reason})
+            response.status_code = 503
+            response.headers["Retry-After"] = str(e.retry_after)
+            return response
+        return None
+
+    @app.teardown_request
+    def _release(exc=None):
+        # Streamed responses tear down when the stream closes, so SSE slots are held until then
+        pool = g.pop('admission_pool', None)
+        if pool is not None:
+            _scheduler.release(pool)
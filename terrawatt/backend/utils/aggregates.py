@@ -0,0 +1,66 @@
+import numpy as np
+
+# Quantities that add up across countries; everything else is an intensity
+# (a share or a per-kWh rate) and is rolled up weighted by generation.
+EXTENSIVE_METRICS = {"total_generation_twh", "battery_storage_mwh", "pumped_hydro_mwh", "co2_emissions_mt"}
+WEIGHT_METRIC = "total_generation_twh"
+
+def membership_matrix(labels):
+    """One-hot (groups x countries) matrix for a per-country label array."""
+    names = np.array(sorted(set(labels)), dtype=object)
+    matrix = (names[:, None] == labels[None, :]).astype(float)
+    return names, matrix
+
+def rollup(cube, matrix):
+    """
+    Rolls a {metric: (countries x years)} cube up to (groups x years) for
+    every metric at once: the metrics are laid side by side into one
+    (countries x metrics*years) array, so a single matrix multiply yields
+    sums for extensive metrics and the weighted numerators for intensities.
+    """
+    metrics = list(cube)
+    weights = np.nan_to_num(cube[WEIGHT_METRIC])
+    blocks = []
+    for metric in metrics:
+        filled = np.nan_to_num(cube[metric])
+        blocks.append(filled if metric in EXTENSIVE_METRICS else filled * weights)
+    blocks.append(weights)
+
+    n_years = weights.shape[1]
+    totals = matrix @ np.hstack(blocks)
+    weight_totals = totals[:, -n_years:]
+
+    grouped = {}
+    for i, metric in enumerate(metrics):
+        block = totals[:, i * n_years:(i + 1) * n_years]
+        if metric in EXTENSIVE_METRICS:
+            grouped[metric] = block
+        else:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                grouped[metric] = block / weight_totals
+    return grouped
+
+def build_prefix_sums(cube):
+    """
+    Cumulative sums over years with a leading zero column, so the total of
+    years [s, e] for every row is sums[:, e + 1] - sums[:, s]. Counts track
+    non-missing values so means ignore gaps.
+    """
+    prefix = {}
+    for metric, values in cube.items():
+        present = ~np.isnan(values)
+        sums = np.zeros((values.shape[0], values.shape[1] + 1))
+        counts = np.zeros((values.shape[0], values.shape[1] + 1), dtype=np.int32)
+        np.cumsum(np.where(present, values, 0.0), axis=1, out=sums[:, 1:])
+        np.cumsum(present, axis=1, out=counts[:, 1:])
+        prefix[metric] = {"sums": sums, "counts": counts}
+    return prefix
+
+def range_query(entry, start_idx, end_idx, op='sum', rows=slice(None)):
+    """O(1)-per-row sum or mean over the inclusive year index range."""
+    total = entry["sums"][rows, end_idx + 1] - entry["sums"][rows, start_idx]
+    if op == 'sum':
+        return total
+    count = entry["counts"][rows, end_idx + 1] - entry["counts"][rows, start_idx]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return total / count
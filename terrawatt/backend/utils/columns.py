@@ -0,0 +1,36 @@
+import numpy as np
+
+# A column is stored as float32 only when every value has at most DECIMALS
+# decimals and a magnitude under 2**17: float32 spacing there stays below
+# half of 10**-DECIMALS, so rounding a stored value back to DECIMALS decimals
+# returns exactly the value in the file. Any other column stays float64.
+DECIMALS = 2
+FLOAT32_LIMIT = 2 ** 17
+
+def encode_categories(values):
+    """Integer codes into a sorted category array; code order matches string order."""
+    categories, codes = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+    return codes.astype(np.min_scalar_type(max(len(categories) - 1, 0))), categories.astype(object)
+
+def compact_floats(values):
+    values = np.asarray(values, dtype=float)
+    finite = values[np.isfinite(values)]
+    if len(finite) and np.abs(finite).max() >= FLOAT32_LIMIT:
+        return values
+    if not np.array_equal(np.round(finite, DECIMALS), finite):
+        return values
+    return values.astype(np.float32)
+
+def column_values(table, name, rows=slice(None)):
+    """
+    Decoded values of a column: strings for categorical columns, float64
+    rounded back to the file's precision for float32 columns. Works on
+    pandas DataFrames too, which are returned unchanged.
+    """
+    values = table[name][rows] if isinstance(table, dict) else table[name]
+    categories = table.get("categories", {}) if isinstance(table, dict) else {}
+    if name in categories:
+        return categories[name][values]
+    if getattr(values, 'dtype', None) == np.float32:
+        return np.round(values.astype(np.float64), DECIMALS)
+    return values
@@ -0,0 +1,97 @@
+import csv
+import difflib
+import re
+import unicodedata
+from bisect import bisect_left
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+FUZZY_CUTOFF = 0.6
+
+def normalize(text):
+    """Casefolded, accent-free, punctuation-free form used for every lookup."""
+    text = unicodedata.normalize('NFKD', str(text))
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(re.sub(r'[^0-9a-z]+', ' ', text.casefold()).split())
+
+class CountryIndex:
+    """
+    Maps numeric ISO ids, ISO3 codes and display names to each other, and
+    answers autocomplete queries from one sorted key list: every name, every
+    word-start suffix of a name ("korea" for "South Korea"), every code and
+    every numeric id. A prefix query is a bisect plus a short forward scan.
+    """
+
+    def __init__(self, rows, data_codes=()):
+        data_codes = set(data_codes)
+        self.records = [
+            {
+                "iso_numeric": row["iso_numeric"].zfill(3),
+                "iso3": row["iso3"].upper(),
+                "name": row["name"],
+                "has_data": row["iso3"].upper() in data_codes
+            }
+            for row in sorted(rows, key=lambda r: normalize(r["name"]))
+        ]
+        self.by_numeric = {r["iso_numeric"]: i for i, r in enumerate(self.records)}
+        self.by_iso3 = {r["iso3"]: i for i, r in enumerate(self.records)}
+        self.names = [normalize(r["name"]) for r in self.records]
+        self.by_name = {name: i for i, name in enumerate(self.names)}
+
+        entries = set()
+        for i, record in enumerate(self.records):
+            words = self.names[i].split()
+            for start in range(len(words)):
+                entries.add((' '.join(words[start:]), i))
+            entries.add((record["iso3"].lower(), i))
+            entries.add((record["iso_numeric"], i))
+        entries = sorted(entries)
+        self.keys = [key for key, _ in entries]
+        self.targets = [i for _, i in entries]
+
+    @classmethod
+    def from_csv(cls, path, data_codes=()):
+        with open(path, newline='') as f:
+            return cls(list(csv.DictReader(f)), data_codes)
+
+    def resolve(self, value):
+        """Record for a numeric id, ISO3 code or exact display name, else None."""
+        value = str(value).strip()
+        if value.isdigit():
+            i = self.by_numeric.get(value.zfill(3))
+        else:
+            i = self.by_iso3.get(value.upper())
+            if i is None:
+                i = self.by_name.get(normalize(value))
+        return None if i is None else self.records[i]
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """
+        Prefix matches ranked exact first, then name starts, then word starts,
+        alphabetically within each; falls back to fuzzy name matches when no
+        prefix matches.
+        """
+        q = normalize(query)
+        if not q:
+            return []
+        best = {}
+        pos = bisect_left(self.keys, q)
+        while pos < len(self.keys) and self.keys[pos].startswith(q):
+            i = self.targets[pos]
+            key = self.keys[pos]
+            if key == q:
+                rank = 0
+            elif self.names[i].startswith(q):
+                rank = 1
+            else:
+                rank = 2
+            best[i] = min(rank, best.get(i, rank))
+            pos += 1
+
+        if best:
+            # records are sorted by name, so the index breaks ties alphabetically
+            ordered = sorted(best, key=lambda i: (best[i], i))
+            return [dict(self.records[i], match="prefix") for i in ordered[:limit]]
+
+        close = difflib.get_close_matches(q, self.names, n=limit, cutoff=FUZZY_CUTOFF)
+        return [dict(self.records[self.by_name[name]], match="fuzzy") for name in close]
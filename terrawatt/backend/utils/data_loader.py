@@ -1,125 +1,647 @@
-import pandas as pd
+import time
+
+# Measured from the first line so NumPy's own import is included in import_ms
+_import_started = time.perf_counter()
+
+import csv
+import io
 import os
+import sys
+import threading
+import resource
 import numpy as np
+from utils.ranking import build_rank_orders, top_k, rank_of
+from utils.aggregates import rollup, build_prefix_sums, range_query
+from utils.groupings import load_groupings, REGION_GROUPING
+from utils.similarity import build_feature_matrix, feature_columns, nearest
+from utils.projection import table_slice
+from utils.columns import encode_categories, compact_floats, column_values
+from utils.memory import deep_nbytes
+from utils.distribution import build_distributions, year_jenks
+from utils.validation import validate_tables, DatasetValidationError
+from utils.country_index import CountryIndex, DEFAULT_LIMIT, MAX_LIMIT
+from utils.timeseries import SeriesStore, parse_time, ANNUAL
+from utils.downsample import downsample
+
+# Columnar tables: {"columns": [...], "categories": {...}, column_name: ndarray},
+# rows sorted by (country_code, year). String columns are integer codes into
+# table["categories"][name]; numeric columns are float32 only when
+# compact_floats() finds that exact (at most 2 decimals, under 2**17) and stay
+# float64 otherwise. Read them through column_values().
+_energy = None
+_emissions = None
+
+# Row-position indexes built once at load time: code -> row slice, year -> row positions
+_energy_by_country = {}
+_energy_by_year = {}
+_emissions_by_country = {}
+_emissions_by_year = {}
+
+STRING_COLUMNS = {"country", "country_code", "region"}
+INT_COLUMNS = {"year"}
+
+# Dense (country x year) arrays per numeric column, aligned on _codes/_years
+ENERGY_METRICS = [
+    "coal_pct", "oil_pct", "gas_pct", "nuclear_pct", "hydro_pct", "wind_pct",
+    "solar_pct", "other_renewables_pct", "renewable_pct", "total_generation_twh",
+    "battery_storage_mwh", "pumped_hydro_mwh"
+]
+EMISSIONS_METRICS = ["co2_emissions_mt", "co2_per_kwh"]
+METRICS = ENERGY_METRICS + EMISSIONS_METRICS
+
+_codes = np.array([], dtype=object)
+_names = np.array([], dtype=object)
+_regions = np.array([], dtype=object)
+_years = np.array([], dtype=int)
+_code_pos = {}
+_year_pos = {}
+_cube = {}
+_rank_orders = {}
 
-# Global cache for dataframes
-_df_energy = None
-_df_emissions = None
+# Group rollups (region column plus data/groups.json) and year prefix sums
+# for O(1) range aggregation; group cubes and prefixes are keyed by grouping
+_groupings = {}
+_group_cubes = {}
+_prefix = {}
+_group_prefix = {}
+
+# Standardized (year x country x feature) matrix for nearest-neighbour search
+_features = {}
+
+# Per-metric, per-year histograms and quantiles for map legends. Jenks breaks
+# are computed on first request per (metric, year) and cached in _jenks.
+_distributions = {}
+_jenks = {}
+_jenks_lock = threading.Lock()
+
+# Numeric id / ISO3 / display name lookup and autocomplete over data/countries.csv
+_country_index = None
+
+# Time-partitioned sub-annual series under data/series, plus annual from _cube
+_series = None
+
+# Guards the one-time load; readiness is reported by the health blueprint
+_load_lock = threading.Lock()
+_ready = threading.Event()
+_load_error = None
+_load_seconds = None
+_validation_report = None
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
 
-def load_data():
-    global _df_energy, _df_emissions
-    if _df_energy is None:
-        _df_energy = pd.read_csv(os.path.join(DATA_DIR, 'energy_mix.csv'))
-        # Ensure renewable_pct is pre-calculated for internal use
-        _df_energy['renewable_pct'] = (
-            _df_energy['hydro_pct'] + 
-            _df_energy['wind_pct'] + 
-            _df_energy['solar_pct'] + 
-            _df_energy['other_renewables_pct']
-        )
-    if _df_emissions is None:
-        _df_emissions = pd.read_csv(os.path.join(DATA_DIR, 'co2_emissions.csv'))
+def _read_table(filename):
+    """Parses a CSV into typed column arrays, sorted by (country_code, year)."""
+    with open(os.path.join(DATA_DIR, filename), newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        raw_columns = list(zip(*reader))
+
+    table = {"columns": list(header), "categories": {}}
+    for name, values in zip(header, raw_columns):
+        if name in STRING_COLUMNS:
+            table[name], table["categories"][name] = encode_categories(values)
+        elif name in INT_COLUMNS:
+            table[name] = np.array(values, dtype=np.int16)
+        else:
+            table[name] = compact_floats(values)
+
+    # Categories are sorted, so sorting the codes sorts by country_code
+    order = np.lexsort((table['year'], table['country_code']))
+    for name in header:
+        table[name] = table[name][order]
+    return table
+
+def _read_energy():
+    table = _read_table('energy_mix.csv')
+    # Ensure renewable_pct is pre-calculated for internal use
+    table['renewable_pct'] = compact_floats(np.round(
+        column_values(table, 'hydro_pct') +
+        column_values(table, 'wind_pct') +
+        column_values(table, 'solar_pct') +
+        column_values(table, 'other_renewables_pct'),
+        2
+    ))
+    table["columns"].append('renewable_pct')
+    return table
+
+def _read_emissions():
+    return _read_table('co2_emissions.csv')
+
+def read_dataset():
+    """
+    Parses both CSVs; returns (energy, emissions) column tables. The csv
+    module holds the GIL, so the files are read one after the other.
+    """
+    return _read_energy(), _read_emissions()
+
+def _build_indexes(table):
+    codes, starts, counts = np.unique(table['country_code'], return_index=True, return_counts=True)
+    names = table["categories"]['country_code'][codes]
+    by_country = {name: slice(int(start), int(start + count)) for name, start, count in zip(names, starts, counts)}
+    years = table['year']
+    by_year = {int(year): np.flatnonzero(years == year).astype(np.int32) for year in np.unique(years)}
+    return by_country, by_year
+
+def _build_cube(energy, emissions):
+    country_codes = column_values(energy, 'country_code')
+    codes, starts, counts = np.unique(country_codes.astype(str), return_index=True, return_counts=True)
+    years = np.unique(energy['year']).astype(np.int64)
+    code_pos = {code: i for i, code in enumerate(codes)}
+    year_pos = {int(year): j for j, year in enumerate(years)}
+
+    # Name and region come from each country's latest row
+    latest = starts + counts - 1
+    names = column_values(energy, 'country', latest)
+    regions = column_values(energy, 'region', latest)
+
+    cube = {}
+    for table, metrics in ((energy, ENERGY_METRICS), (emissions, EMISSIONS_METRICS)):
+        rows = np.searchsorted(codes, column_values(table, 'country_code').astype(str))
+        cols = np.searchsorted(years, table['year'])
+        for metric in metrics:
+            values = np.full((len(codes), len(years)), np.nan)
+            values[rows, cols] = column_values(table, metric)
+            cube[metric] = values
+    return codes.astype(object), names, regions, years, code_pos, year_pos, cube
+
+class DataNotReady(RuntimeError):
+    """Raised by data functions after the load failed; routes answer 503."""
+
+def load_data(reload=False):
+    """
+    Loads both CSVs exactly once, validates them and builds the
+    lookup indexes. A dataset that fails validation is never served.
+    Concurrent callers block on the lock until the first load has finished.
+    A failed load is recorded once: later calls raise DataNotReady at once
+    instead of re-reading the files, until reload=True retries it.
+    """
+    global _energy, _emissions, _load_error, _load_seconds, _validation_report
+    global _energy_by_country, _energy_by_year, _emissions_by_country, _emissions_by_year
+    global _codes, _names, _regions, _years, _code_pos, _year_pos, _cube, _rank_orders
+    global _groupings, _group_cubes, _prefix, _group_prefix, _features, _distributions, _jenks, _country_index, _series
+    if _ready.is_set():
+        return
+    if _load_error is not None and not reload:
+        raise DataNotReady(_load_error)
+    with _load_lock:
+        if _ready.is_set():
+            return
+        if _load_error is not None and not reload:
+            raise DataNotReady(_load_error)
+        started = time.perf_counter()
+        try:
+            energy, emissions = read_dataset()
+            _validation_report = validate_tables(energy, emissions)
+            if not _validation_report["ok"]:
+                raise DatasetValidationError(_validation_report)
+
+            _energy_by_country, _energy_by_year = _build_indexes(energy)
+            _emissions_by_country, _emissions_by_year = _build_indexes(emissions)
+            _codes, _names, _regions, _years, _code_pos, _year_pos, _cube = _build_cube(energy, emissions)
+            _rank_orders = build_rank_orders(_cube)
+            _groupings = load_groupings(os.path.join(DATA_DIR, 'groups.json'), _codes, _regions)
+            _group_cubes = {name: rollup(_cube, g["matrix"]) for name, g in _groupings.items()}
+            _prefix = build_prefix_sums(_cube)
+            _group_prefix = {name: build_prefix_sums(cube) for name, cube in _group_cubes.items()}
+            _features = build_feature_matrix(_cube)
+            _distributions = build_distributions(_cube, _years)
+            _jenks = {}
+            _country_index = CountryIndex.from_csv(os.path.join(DATA_DIR, 'countries.csv'), _codes)
+            _series = SeriesStore(os.path.join(DATA_DIR, 'series'), _codes, _years, _cube)
+            _energy = energy
+            _emissions = emissions
+        except Exception as e:
+            _load_error = str(e)
+            raise
+        _load_error = None
+        _load_seconds = time.perf_counter() - started
+        _ready.set()
+
+def start_background_load():
+    """Kicks off load_data() in a daemon thread so the worker can answer health probes while warming."""
+    def _run():
+        try:
+            load_data()
+        except Exception:
+            # Recorded in _load_error and surfaced through get_load_status()
+            pass
+    thread = threading.Thread(target=_run, name='data-loader', daemon=True)
+    thread.start()
+    return thread
+
+def get_process_stats():
+    """
+    Startup cost of this worker: how long the data layer took to import and
+    load, peak RSS, and whether pandas ended up imported at all.
+    """
+    # ru_maxrss is kilobytes on Linux but bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        max_rss //= 1024
+    return {
+        "import_ms": round(_import_ms, 2),
+        "load_ms": None if _load_seconds is None else round(_load_seconds * 1000, 2),
+        "max_rss_mb": round(max_rss / 1024, 1),
+        "pandas_imported": 'pandas' in sys.modules
+    }
 
-def get_country_data(country_code, start_year=2000, end_year=2024):
+def get_memory_report():
+    """
+    Bytes held by every table, index and derived cache. Arrays shared
+    between structures are counted once, under the first entry that holds
+    them; memory-mapped series partitions are not counted.
+    """
     load_data()
-    mask = (
-        (_df_energy['country_code'] == country_code) & 
-        (_df_energy['year'] >= int(start_year)) & 
-        (_df_energy['year'] <= int(end_year))
-    )
-    return _df_energy[mask].to_dict(orient='records')
+    seen = set()
+
+    def table_report(table):
+        columns = {name: deep_nbytes(table[name], seen) for name in table["columns"]}
+        categories = deep_nbytes(table["categories"], seen)
+        return {"columns": columns, "categories": categories, "total": sum(columns.values()) + categories}
+
+    sections = {
+        "tables": {"energy": table_report(_energy), "emissions": table_report(_emissions)},
+        "indexes": {
+            "energy_by_country": deep_nbytes(_energy_by_country, seen),
+            "energy_by_year": deep_nbytes(_energy_by_year, seen),
+            "emissions_by_country": deep_nbytes(_emissions_by_country, seen),
+            "emissions_by_year": deep_nbytes(_emissions_by_year, seen),
+            "country_axes": deep_nbytes([_codes, _names, _regions, _years, _code_pos, _year_pos], seen),
+            "country_index": deep_nbytes(_country_index, seen)
+        },
+        "caches": {
+            "cube": deep_nbytes(_cube, seen),
+            "rank_orders": deep_nbytes(_rank_orders, seen),
+            "groupings": deep_nbytes(_groupings, seen),
+            "group_cubes": deep_nbytes(_group_cubes, seen),
+            "prefix": deep_nbytes(_prefix, seen),
+            "group_prefix": deep_nbytes(_group_prefix, seen),
+            "features": deep_nbytes(_features, seen),
+            "distributions": deep_nbytes(_distributions, seen),
+            "series": deep_nbytes(_series, seen)
+        }
+    }
+    totals = {
+        "tables": sum(t["total"] for t in sections["tables"].values()),
+        "indexes": sum(sections["indexes"].values()),
+        "caches": sum(sections["caches"].values())
+    }
+    totals["all"] = sum(totals.values())
+    return {**sections, "totals": totals, "process": get_process_stats()}
+
+def get_load_status():
+    if _ready.is_set():
+        return {
+            "status": "ready",
+            "countries": len(_energy_by_country),
+            "years": len(_energy_by_year),
+            "energy_rows": len(_energy['year']),
+            "emissions_rows": len(_emissions['year']),
+            "validation": {"ok": True, "warnings": _validation_report["warnings"]},
+            "process": get_process_stats()
+        }
+    if _load_error is not None:
+        status = {"status": "error", "error": _load_error}
+        if _validation_report is not None and not _validation_report["ok"]:
+            status["validation"] = {"ok": False, "errors": _validation_report["errors"]}
+        return status
+    return {"status": "loading"}
 
-def get_emissions_data(country_code, start_year=2000, end_year=2024):
+def get_validation_report():
+    return _validation_report
+
+def _country_rows(table, index, country_code, start_year, end_year):
+    rows = index.get(country_code)
+    if rows is None:
+        return []
+    # Rows are year-sorted within a country, so the range is a slice (a view, not a copy)
+    years = table['year'][rows]
+    lo = rows.start + int(np.searchsorted(years, int(start_year), side='left'))
+    hi = rows.start + int(np.searchsorted(years, int(end_year), side='right'))
+    return slice(lo, max(lo, hi))
+
+def get_country_data(country_code, start_year=2000, end_year=2024, fields=None, layout='rows'):
+    load_data()
+    rows = _country_rows(_energy, _energy_by_country, country_code, start_year, end_year)
+    return table_slice(_energy, rows, fields, layout)
+
+def get_emissions_data(country_code, start_year=2000, end_year=2024, fields=None, layout='rows'):
     load_data()
-    mask = (
-        (_df_emissions['country_code'] == country_code) & 
-        (_df_emissions['year'] >= int(start_year)) & 
-        (_df_emissions['year'] <= int(end_year))
-    )
-    return _df_emissions[mask].to_dict(orient='records')
+    rows = _country_rows(_emissions, _emissions_by_country, country_code, start_year, end_year)
+    return table_slice(_emissions, rows, fields, layout)
 
-def get_all_countries_for_year(year):
+def get_all_countries_for_year(year, fields=None, layout='rows'):
     load_data()
-    mask = _df_energy['year'] == int(year)
-    return _df_energy[mask].to_dict(orient='records')
+    return table_slice(_energy, _energy_by_year.get(int(year), []), fields, layout)
 
-def get_renewable_pct(year):
+MAP_KEYS = ('code', 'numeric')
+
+def get_renewable_pct(year, key='code'):
     """
-    Returns a list of {id: country_code, value: renewable_pct} for the map.
+    Returns a list of {id, value: renewable_pct} for the map. `id` is the
+    country code, or the numeric ISO id used by the map's geometries when
+    key is 'numeric'.
     """
     load_data()
-    mask = _df_energy['year'] == int(year)
-    df_year = _df_energy[mask]
+    if key not in MAP_KEYS:
+        raise ValueError(f"key must be one of: {', '.join(MAP_KEYS)}")
+    rows = _energy_by_year.get(int(year), [])
+    codes = column_values(_energy, 'country_code', rows).tolist()
+    values = column_values(_energy, 'renewable_pct', rows).tolist()
     
     result = []
-    for _, row in df_year.iterrows():
+    for code, value in zip(codes, values):
+        if key == 'numeric':
+            record = _country_index.resolve(code)
+            if record is None:
+                continue
+            code = record["iso_numeric"]
         result.append({
-            "id": row['country_code'],
-            "value": round(row['renewable_pct'], 2)
+            "id": code,
+            "value": round(value, 2)
         })
     return result
 
 def get_leaderboards(year):
     load_data()
-    mask_e = _df_energy['year'] == int(year)
-    mask_em = _df_emissions['year'] == int(year)
-    
-    # Renewable Top 10
-    top_renewable = _df_energy[mask_e].sort_values('renewable_pct', ascending=False).head(10)
-    
-    # Lowest Emissions Top 10
-    top_clean = _df_emissions[mask_em].sort_values('co2_per_kwh', ascending=True).head(10)
     
     # Fastest Transition (last 5 years)
     current_year = int(year)
     past_year = current_year - 5
     
-    past_data = _df_energy[_df_energy['year'] == past_year][['country_code', 'renewable_pct']]
-    curr_data = _df_energy[mask_e][['country_code', 'country', 'renewable_pct']]
-    
-    merged = curr_data.merge(past_data, on='country_code', suffixes=('_now', '_past'))
-    merged['improvement'] = merged['renewable_pct_now'] - merged['renewable_pct_past']
-    top_improvers = merged.sort_values('improvement', ascending=False).head(10)
+    improvement = _year_delta('renewable_pct', past_year, current_year)
+    top_improvers = []
+    if improvement is not None:
+        valid = np.flatnonzero(~np.isnan(improvement))
+        k = min(10, len(valid))
+        if k:
+            best = valid[np.argpartition(-improvement[valid], k - 1)[:k]]
+            best = best[np.argsort(-improvement[best], kind='stable')]
+            top_improvers = [
+                {"country": _names[i], "country_code": _codes[i], "improvement": float(improvement[i])}
+                for i in best
+            ]
 
     return {
-        "renewable": top_renewable[['country', 'country_code', 'renewable_pct']].to_dict(orient='records'),
-        "clean": top_clean[['country', 'country_code', 'co2_per_kwh']].to_dict(orient='records'),
-        "improvers": top_improvers[['country', 'country_code', 'improvement']].to_dict(orient='records')
+        "renewable": _ranked_rows('renewable_pct', current_year, 10, descending=True),
+        "clean": _ranked_rows('co2_per_kwh', current_year, 10, descending=False),
+        "improvers": top_improvers
     }
 
-def get_regional_aggregates(year):
+def _year_delta(metric, from_year, to_year):
+    from_idx = _year_pos.get(from_year)
+    to_idx = _year_pos.get(to_year)
+    if from_idx is None or to_idx is None:
+        return None
+    values = _cube[metric]
+    return values[:, to_idx] - values[:, from_idx]
+
+def get_deltas(from_year, to_year, metrics=None):
+    """
+    Per-country change between two years for each requested metric, taken as
+    a subtraction of two aligned year columns of the (country x year) arrays.
+    """
     load_data()
-    mask = _df_energy['year'] == int(year)
-    # Weighted average by total generation
-    df_year = _df_energy[mask].copy()
-    
-    regions = df_year.groupby('region').apply(lambda x: pd.Series({
-        "renewable_pct": np.average(x['renewable_pct'], weights=x['total_generation_twh']),
-        "total_generation_twh": x['total_generation_twh'].sum(),
-        "battery_storage_mwh": x['battery_storage_mwh'].sum(),
-        "pumped_hydro_mwh": x['pumped_hydro_mwh'].sum()
-    }), include_groups=False).reset_index()
-    
-    return regions.to_dict(orient='records')
+    from_year, to_year = int(from_year), int(to_year)
+    metrics = metrics or METRICS
+    for metric in metrics:
+        if metric not in _cube:
+            raise ValueError(f"Unknown metric '{metric}'. Choose from: {', '.join(METRICS)}")
+    for y in (from_year, to_year):
+        if y not in _year_pos:
+            raise ValueError(f"No data for year {y}")
+
+    deltas = np.column_stack([_year_delta(metric, from_year, to_year) for metric in metrics])
+    rounded = np.round(deltas, 4)
+    result = []
+    for i in np.flatnonzero(~np.isnan(deltas).all(axis=1)):
+        row = {"country": _names[i], "country_code": _codes[i]}
+        for metric, value in zip(metrics, rounded[i]):
+            row[metric] = None if np.isnan(value) else float(value)
+        result.append(row)
+    return result
+
+def _ranked_rows(metric, year, k, descending=True, region=None):
+    year_idx = _year_pos.get(year)
+    if year_idx is None:
+        return []
+    allowed = _regions == region if region else None
+    values = _cube[metric][:, year_idx]
+    return [
+        {"country": _names[i], "country_code": _codes[i], metric: float(values[i])}
+        for i in top_k(_rank_orders[metric], year_idx, k, descending, allowed)
+    ]
+
+def get_rankings(metric, year, k=10, order='desc', region=None):
+    """
+    Top-k countries for any numeric column, served from the precomputed
+    per-year sort orders instead of sorting the year slice.
+    """
+    load_data()
+    if metric not in _rank_orders:
+        raise ValueError(f"Unknown metric '{metric}'. Choose from: {', '.join(METRICS)}")
+    if order not in ('asc', 'desc'):
+        raise ValueError("order must be 'asc' or 'desc'")
+    descending = order == 'desc'
+    rows = _ranked_rows(metric, int(year), max(int(k), 0), descending, region)
+    for rank, row in enumerate(rows, start=1):
+        row["rank"] = rank
+    return rows
+
+def get_country_ranks(country_code, year, metrics=None):
+    """
+    Rank (highest value = 1) and percentile of one country for each metric.
+    """
+    load_data()
+    country_idx = _code_pos.get(country_code)
+    year_idx = _year_pos.get(int(year))
+    if country_idx is None or year_idx is None:
+        return {}
+
+    result = {}
+    for metric in metrics or METRICS:
+        if metric not in _rank_orders:
+            raise ValueError(f"Unknown metric '{metric}'")
+        ranked = rank_of(_rank_orders[metric], year_idx, country_idx)
+        if ranked is None:
+            continue
+        rank, percentile, count = ranked
+        result[metric] = {
+            "value": float(_cube[metric][country_idx, year_idx]),
+            "rank": rank,
+            "of": count,
+            "percentile": round(percentile, 1)
+        }
+    return result
+
+def _year_range(start_year, end_year):
+    start_year, end_year = int(start_year), int(end_year)
+    if start_year > end_year:
+        raise ValueError("start_year must not be after end_year")
+    start_idx = int(np.searchsorted(_years, start_year, side='left'))
+    end_idx = int(np.searchsorted(_years, end_year, side='right')) - 1
+    if start_idx > end_idx:
+        raise ValueError(f"No data between {start_year} and {end_year}")
+    return start_idx, end_idx
+
+def _json_number(value):
+    return None if np.isnan(value) else round(float(value), 4)
+
+def _find_group(entity, grouping=None):
+    for name in ([grouping] if grouping else _groupings):
+        if name not in _groupings:
+            raise ValueError(f"Unknown grouping '{name}'")
+        matches = np.flatnonzero(_groupings[name]["names"] == entity)
+        if len(matches):
+            return name, int(matches[0])
+    return None, None
+
+def get_aggregate(entity, metric, start_year=2000, end_year=2024, op='sum', grouping=None):
+    """
+    Sum or mean of a metric over an inclusive year range for a country code,
+    a group from any grouping (a region, EU-27, ...), or every country at
+    once (entity 'all').
+    """
+    load_data()
+    if metric not in _prefix:
+        raise ValueError(f"Unknown metric '{metric}'. Choose from: {', '.join(METRICS)}")
+    if op not in ('sum', 'mean'):
+        raise ValueError("op must be 'sum' or 'mean'")
+    start_idx, end_idx = _year_range(start_year, end_year)
+    span = {"metric": metric, "op": op, "start_year": int(_years[start_idx]), "end_year": int(_years[end_idx])}
+
+    if entity in (None, '', 'all'):
+        values = range_query(_prefix[metric], start_idx, end_idx, op)
+        return [
+            {"country_code": code, "value": _json_number(value)}
+            for code, value in zip(_codes, values)
+        ]
+
+    if entity in _code_pos and not grouping:
+        entry, row = _prefix[metric], _code_pos[entity]
+    else:
+        found, row = _find_group(entity, grouping)
+        if found is None:
+            raise ValueError(f"Unknown entity '{entity}'")
+        entry = _group_prefix[found][metric]
+
+    value = range_query(entry, start_idx, end_idx, op, rows=row)
+    return {"entity": entity, **span, "value": _json_number(value)}
+
+def get_similar_countries(country_code, year=2024, target_year=None, k=5, features=None):
+    """
+    The k countries whose grid in `target_year` (default: same year) is
+    closest to `country_code`'s grid in `year`.
+    """
+    load_data()
+    country_idx = _code_pos.get(country_code)
+    if country_idx is None:
+        raise ValueError(f"Unknown country_code '{country_code}'")
+    year = int(year)
+    target_year = year if target_year is None else int(target_year)
+    for y in (year, target_year):
+        if y not in _year_pos:
+            raise ValueError(f"No data for year {y}")
+
+    columns = feature_columns(features or [], _features["names"])
+    matrix = _features["matrix"]
+    query = matrix[_year_pos[year], country_idx]
+    # Comparing a country with itself is only meaningful across years
+    exclude = country_idx if target_year == year else None
+    picked, distances = nearest(columns, query, matrix[_year_pos[target_year]], int(k), exclude)
+
+    return [
+        {
+            "country": _names[i],
+            "country_code": _codes[i],
+            "year": target_year,
+            "distance": round(float(d), 4)
+        }
+        for i, d in zip(picked, distances)
+    ]
+
+def _with_jenks(metric, year, summary):
+    if not summary["count"]:
+        return summary
+    with _jenks_lock:
+        breaks = _jenks.get((metric, year))
+        if breaks is None:
+            breaks = _jenks[(metric, year)] = year_jenks(_cube[metric][:, _year_pos[year]])
+    return {**summary, "jenks": breaks}
+
+def get_distribution(metric, year=None):
+    """
+    Value distribution of a metric for one year, or for every year when
+    `year` is None (for the animated map slider).
+    """
+    load_data()
+    if metric not in _distributions:
+        raise ValueError(f"Unknown metric '{metric}'. Choose from: {', '.join(METRICS)}")
+    entry = _distributions[metric]
+    result = {"metric": metric, "domain": entry["domain"], "histogram_edges": entry["histogram_edges"]}
+    if year is None:
+        result["years"] = {y: _with_jenks(metric, y, summary) for y, summary in entry["years"].items()}
+        return result
+    summary = entry["years"].get(int(year))
+    if summary is None:
+        raise ValueError(f"No data for year {year}")
+    return {**result, "year": int(year), **_with_jenks(metric, int(year), summary)}
+
+def get_groupings():
+    """Every grouping with its groups, member codes and any unknown codes."""
+    load_data()
+    result = {}
+    for name, grouping in _groupings.items():
+        result[name] = {
+            str(group): {
+                "members": _codes[grouping["matrix"][i] > 0].tolist(),
+                "missing": grouping["missing"].get(group, [])
+            }
+            for i, group in enumerate(grouping["names"])
+        }
+    return result
+
+def get_regional_aggregates(year, grouping=REGION_GROUPING):
+    load_data()
+    if grouping not in _groupings:
+        raise ValueError(f"Unknown grouping '{grouping}'. Choose from: {', '.join(_groupings)}")
+    year_idx = _year_pos.get(int(year))
+    if year_idx is None:
+        return []
+    # Group rows were rolled up at load time; renewable_pct is generation-weighted
+    cube = _group_cubes[grouping]
+    label = "region" if grouping == REGION_GROUPING else "group"
+    return [
+        {
+            label: group,
+            "renewable_pct": float(cube['renewable_pct'][i, year_idx]),
+            "total_generation_twh": float(cube['total_generation_twh'][i, year_idx]),
+            "battery_storage_mwh": float(cube['battery_storage_mwh'][i, year_idx]),
+            "pumped_hydro_mwh": float(cube['pumped_hydro_mwh'][i, year_idx])
+        }
+        for i, group in enumerate(_groupings[grouping]["names"])
+    ]
 
 def predict_trends(country_code):
     load_data()
     # Simple linear regression for renewable_pct and co2_per_kwh
-    country_energy = _df_energy[_df_energy['country_code'] == country_code].sort_values('year')
-    country_emissions = _df_emissions[_df_emissions['country_code'] == country_code].sort_values('year')
+    country_idx = _code_pos.get(country_code)
+    if country_idx is None:
+        return {"error": "Not enough data for prediction"}
+    ren_vals = _cube['renewable_pct'][country_idx]
+    em_vals = _cube['co2_per_kwh'][country_idx]
+    present = ~np.isnan(ren_vals) & ~np.isnan(em_vals)
     
-    if len(country_energy) < 5:
+    if present.sum() < 5:
         return {"error": "Not enough data for prediction"}
         
     def lin_reg(x, y, target_x):
         coeffs = np.polyfit(x, y, 1)
-        return np.polyval(coeffs, target_x)
+        return float(np.polyval(coeffs, target_x))
 
-    years = country_energy['year'].values
-    ren_vals = country_energy['renewable_pct'].values
-    em_vals = country_emissions['co2_per_kwh'].values
+    years = _years[present]
+    ren_vals = ren_vals[present]
+    em_vals = em_vals[present]
     
     future_years = [2025, 2030, 2040, 2050]
     predictions = []
@@ -133,13 +655,64 @@ def predict_trends(country_code):
         
     return predictions
 
-def get_emissions_comparison(year):
+def get_emissions_comparison(year, fields=None, layout='rows'):
     load_data()
-    mask = _df_emissions['year'] == int(year)
-    return _df_emissions[mask].to_dict(orient='records')
+    return table_slice(_emissions, _emissions_by_year.get(int(year), []), fields, layout)
+
+def get_series(country_code, metric, start=None, end=None, resolution=ANNUAL, points=500, method='lttb'):
+    """
+    One metric for one country over a time range at any stored resolution,
+    downsampled on the server to at most `points` points so the payload
+    stays bounded whatever the underlying resolution. Times are epoch seconds.
+    """
+    load_data()
+    start = parse_time(start) if start else None
+    end = parse_time(end, end=True) if end else None
+    t, v = _series.read(country_code, metric, resolution, start, end)
+    source_points = int(len(t))
+    t, series = downsample(t, np.asarray(v, dtype=float), int(points), method)
+    result = {
+        "country_code": country_code,
+        "metric": metric,
+        "resolution": resolution,
+        "resolutions": _series.resolutions(country_code),
+        "method": method,
+        "source_points": source_points,
+        "points": int(len(t)),
+        "time": np.round(t).astype(np.int64).tolist()
+    }
+    for name, values in series.items():
+        result[name] = [_json_number(x) for x in values]
+    return result
+
+def get_countries():
+    """Every known country: numeric id, ISO3 code, display name and whether it has data."""
+    load_data()
+    return _country_index.records
+
+def resolve_country(value):
+    """Looks up one country by numeric id, ISO3 code or display name."""
+    load_data()
+    record = _country_index.resolve(value)
+    if record is None:
+        raise ValueError(f"Unknown country '{value}'")
+    return record
+
+def search_countries(query, limit=DEFAULT_LIMIT):
+    """Autocomplete over names, codes and numeric ids."""
+    load_data()
+    limit = int(limit)
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+    return _country_index.search(query, limit)
 
 def to_csv(data):
     if not data:
         return ""
-    df = pd.DataFrame(data)
-    return df.to_csv(index=False)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(data[0].keys()), lineterminator='\n')
+    writer.writeheader()
+    writer.writerows(data)
+    return buffer.getvalue()
+
+_import_ms = (time.perf_counter() - _import_started) * 1000
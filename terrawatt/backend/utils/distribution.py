@@ -0,0 +1,91 @@
+import numpy as np
+
+HISTOGRAM_BINS = 20
+CLASSES = 5
+QUANTILES = np.linspace(0, 1, CLASSES + 1)
+# jenks_breaks is O(n^2) in time and memory; larger years run on this many quantiles
+JENKS_SAMPLE = 512
+
+def jenks_breaks(sorted_values, classes):
+    """
+    Fisher-Jenks natural breaks on sorted values: the split into `classes`
+    contiguous groups with the least total within-group squared deviation.
+    Each DP step is one (n x n) array operation instead of a Python loop
+    over split points. Returns [min, upper bound of each class...].
+    """
+    n = len(sorted_values)
+    classes = min(classes, len(np.unique(sorted_values)))
+    if classes < 2:
+        return [float(sorted_values[0]), float(sorted_values[-1])] if n else []
+
+    s1 = np.concatenate(([0.0], np.cumsum(sorted_values)))
+    s2 = np.concatenate(([0.0], np.cumsum(sorted_values * sorted_values)))
+    start = np.arange(n)[:, None]
+    end = np.arange(n)[None, :]
+    size = end - start + 1
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # ssd[j, i]: squared deviation of values j..i as one class
+        ssd = (s2[end + 1] - s2[start]) - (s1[end + 1] - s1[start]) ** 2 / size
+    ssd[size <= 0] = np.inf
+
+    cost = ssd[0]
+    back = []
+    for _ in range(1, classes):
+        # A class starting at j follows the best split of 0..j-1
+        prev = np.concatenate(([np.inf], cost[:-1]))
+        total = prev[:, None] + ssd
+        back.append(np.argmin(total, axis=0))
+        cost = total[back[-1], np.arange(n)]
+
+    upper = [n - 1]
+    end_idx = n - 1
+    for choice in reversed(back):
+        start_idx = int(choice[end_idx])
+        end_idx = start_idx - 1
+        upper.append(end_idx)
+    upper.reverse()
+    return [float(sorted_values[0])] + [float(sorted_values[i]) for i in upper]
+
+def _summarize(values, edges):
+    present = np.sort(values[~np.isnan(values)])
+    if len(present) == 0:
+        return {"count": 0}
+    counts, _ = np.histogram(present, bins=edges)
+    return {
+        "count": int(len(present)),
+        "min": float(present[0]),
+        "max": float(present[-1]),
+        "mean": round(float(present.mean()), 4),
+        "quantiles": [round(float(q), 4) for q in np.quantile(present, QUANTILES)],
+        "histogram": counts.tolist()
+    }
+
+def year_jenks(values):
+    """
+    Jenks breaks for one year's values. Above JENKS_SAMPLE values the breaks
+    are fitted to evenly spaced quantiles, which keep the min and max.
+    """
+    present = np.sort(values[~np.isnan(values)])
+    if len(present) > JENKS_SAMPLE:
+        present = np.quantile(present, np.linspace(0, 1, JENKS_SAMPLE))
+    return [round(b, 4) for b in jenks_breaks(present, CLASSES)]
+
+def build_distributions(cube, years):
+    """
+    Per metric: shared histogram edges over the metric's full range (so an
+    animated legend keeps its scale) and a per-year summary. Jenks breaks
+    are left to year_jenks() so they are only computed for metrics a map asks for.
+    """
+    distributions = {}
+    for metric, values in cube.items():
+        finite = values[~np.isnan(values)]
+        low, high = (float(finite.min()), float(finite.max())) if len(finite) else (0.0, 1.0)
+        if high <= low:
+            high = low + 1.0
+        edges = np.linspace(low, high, HISTOGRAM_BINS + 1)
+        distributions[metric] = {
+            "domain": [low, high],
+            "histogram_edges": [round(float(e), 4) for e in edges],
+            "years": {int(year): _summarize(values[:, j], edges) for j, year in enumerate(years)}
+        }
+    return distributions
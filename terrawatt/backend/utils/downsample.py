@@ -0,0 +1,72 @@
+import numpy as np
+
+METHODS = ('mean', 'minmax', 'lttb')
+MAX_POINTS = 5000
+
+def _buckets(t, points):
+    """Start offsets of equal-width time buckets over sorted timestamps, skipping empty ones."""
+    edges = np.linspace(t[0], t[-1], points + 1)[1:-1]
+    starts = np.concatenate(([0], np.searchsorted(t, edges, side='right')))
+    return np.unique(starts)
+
+def bucket_mean(t, v, points):
+    """Mean time and mean value per bucket: one np.add.reduceat per array."""
+    starts = _buckets(t, points)
+    counts = np.diff(np.append(starts, len(t)))
+    return np.add.reduceat(t, starts) / counts, {"value": np.add.reduceat(v, starts) / counts}
+
+def bucket_minmax(t, v, points):
+    """Mean, min and max per bucket, so a chart can draw the envelope around the line."""
+    starts = _buckets(t, points)
+    counts = np.diff(np.append(starts, len(t)))
+    return np.add.reduceat(t, starts) / counts, {
+        "value": np.add.reduceat(v, starts) / counts,
+        "min": np.minimum.reduceat(v, starts),
+        "max": np.maximum.reduceat(v, starts)
+    }
+
+def lttb(t, v, points):
+    """
+    Largest-Triangle-Three-Buckets: keeps the first and last points and, from
+    each bucket in between, the point forming the largest triangle with the
+    previously kept point and the next bucket's average. Preserves peaks that
+    averaging would flatten.
+    """
+    n = len(t)
+    edges = np.linspace(1, n - 1, points - 1).astype(np.int64)
+    keep = np.empty(points, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    t = t.astype(float)
+    for b in range(points - 2):
+        # n > points makes every bucket at least one point wide
+        lo, hi = edges[b], edges[b + 1]
+        if b + 2 < len(edges):
+            next_t, next_v = t[hi:edges[b + 2]].mean(), v[hi:edges[b + 2]].mean()
+        else:
+            next_t, next_v = t[-1], v[-1]
+        a = keep[b]
+        area = np.abs((t[a] - next_t) * (v[lo:hi] - v[a]) - (t[a] - t[lo:hi]) * (next_v - v[a]))
+        keep[b + 1] = lo + int(np.argmax(area))
+    return t[keep], {"value": v[keep]}
+
+def downsample(t, v, points, method='lttb'):
+    """
+    Reduces a sorted series to at most `points` points. Missing values are
+    dropped first; series already within budget are returned as-is.
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of: {', '.join(METHODS)}")
+    if not 3 <= points <= MAX_POINTS:
+        raise ValueError(f"points must be between 3 and {MAX_POINTS}")
+    present = ~np.isnan(v)
+    t, v = t[present], v[present].astype(float)
+    if len(t) <= points:
+        series = {"value": v}
+        if method == 'minmax':
+            series.update({"min": v, "max": v})
+        return t, series
+    if method == 'mean':
+        return bucket_mean(t, v, points)
+    if method == 'minmax':
+        return bucket_minmax(t, v, points)
+    return lttb(t, v, points)
@@ -0,0 +1,44 @@
+import json
+import numpy as np
+from utils.aggregates import membership_matrix
+
+# The region column is always available as a grouping; others come from the config file
+REGION_GROUPING = "region"
+
+def _group_matrix(groups, code_pos):
+    """
+    (groups x countries) 0/1 membership matrix for possibly overlapping groups.
+    Codes that are not in the dataset are skipped and reported.
+    """
+    names = np.array(list(groups), dtype=object)
+    matrix = np.zeros((len(names), len(code_pos)))
+    missing = {}
+    for i, name in enumerate(names):
+        members = [code_pos[code] for code in groups[name] if code in code_pos]
+        matrix[i, members] = 1.0
+        unknown = [code for code in groups[name] if code not in code_pos]
+        if unknown:
+            missing[name] = unknown
+    return names, matrix, missing
+
+def load_groupings(path, codes, regions):
+    """
+    Compiles the built-in region grouping and every grouping in the JSON
+    config ({grouping: {group: [country codes]}}) into membership matrices.
+    """
+    code_pos = {code: i for i, code in enumerate(codes)}
+    names, matrix = membership_matrix(regions)
+    groupings = {REGION_GROUPING: {"names": names, "matrix": matrix, "missing": {}}}
+
+    try:
+        with open(path) as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        config = {}
+
+    for grouping, groups in config.items():
+        if grouping == REGION_GROUPING:
+            raise ValueError(f"'{REGION_GROUPING}' is reserved for the region column")
+        names, matrix, missing = _group_matrix(groups, code_pos)
+        groupings[grouping] = {"names": names, "matrix": matrix, "missing": missing}
+    return groupings
@@ -0,0 +1,33 @@
+import sys
+import numpy as np
+
+def deep_nbytes(obj, seen=None):
+    """
+    Bytes held by a structure of dicts, lists, arrays and plain objects.
+    Anything already in `seen` (by id) is not counted again, so arrays
+    shared between structures are charged to the first one reported.
+    """
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, np.memmap):
+        # Memory-mapped pages belong to the page cache, not the process heap
+        return 0
+    if isinstance(obj, np.ndarray):
+        if obj.base is not None:
+            # A view: charge the array that owns the buffer, once
+            return deep_nbytes(obj.base, seen)
+        size = obj.nbytes
+        if obj.dtype == object:
+            size += sum(deep_nbytes(item, seen) for item in obj.ravel())
+        return size
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_nbytes(k, seen) + deep_nbytes(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_nbytes(item, seen) for item in obj)
+    elif hasattr(obj, '__dict__'):
+        size += deep_nbytes(vars(obj), seen)
+    return size
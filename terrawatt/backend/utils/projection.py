@@ -0,0 +1,68 @@
+from utils.columns import column_values
+
+LAYOUTS = ('rows', 'columns')
+
+def parse_projection(args):
+    """
+    Reads `fields` (comma-separated column names) and `layout` ('rows' for a
+    list of objects, 'columns' for one array per field) from query args.
+    """
+    fields = args.get('fields')
+    layout = args.get('layout', 'rows')
+    if layout not in LAYOUTS:
+        raise ValueError(f"layout must be one of: {', '.join(LAYOUTS)}")
+    return ([f for f in fields.split(',') if f] if fields else None), layout
+
+def _select_fields(available, fields):
+    if fields is None:
+        return list(available)
+    unknown = [f for f in fields if f not in available]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}. Choose from: {', '.join(available)}")
+    return list(fields)
+
+def table_slice(table, rows, fields=None, layout='rows'):
+    """
+    Projects rows of a columnar table. The 'columns' layout is built straight
+    from the column arrays without creating a dict per row.
+    """
+    columns = _select_fields(table["columns"], fields)
+    values = [column_values(table, name, rows).tolist() for name in columns]
+    if layout == 'columns':
+        return dict(zip(columns, values))
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+def shape_record(record, fields=None, layout='rows'):
+    """Projection for endpoints that return one object: `fields` picks its keys."""
+    if layout == 'columns':
+        raise ValueError("layout=columns needs a list result; this endpoint returns a single object")
+    if fields is None:
+        return record
+    return {name: record[name] for name in _select_fields(list(record), fields)}
+
+def shape_groups(groups, fields=None, layout='rows'):
+    """
+    Projection for a dict of row lists whose keys differ between lists (the
+    leaderboards): a field is valid if any list has it, and each list keeps
+    the requested fields it has.
+    """
+    available = list(dict.fromkeys(key for rows in groups.values() for row in rows[:1] for key in row))
+    if fields is not None:
+        _select_fields(available, fields)
+    shaped = {}
+    for name, rows in groups.items():
+        own = list(rows[0].keys()) if rows else []
+        shaped[name] = shape_rows(rows, [f for f in fields if f in own] if fields is not None else None, layout)
+    return shaped
+
+def shape_rows(rows, fields=None, layout='rows'):
+    """Same projection for endpoints that already produce a list of dicts."""
+    if isinstance(rows, dict):
+        return shape_record(rows, fields, layout)
+    available = list(rows[0].keys()) if rows else list(fields or [])
+    columns = _select_fields(available, fields)
+    if layout == 'columns':
+        return {name: [row.get(name) for row in rows] for name in columns}
+    if fields is None:
+        return rows
+    return [{name: row.get(name) for name in columns} for row in rows]
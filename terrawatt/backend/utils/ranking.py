@@ -0,0 +1,63 @@
+import numpy as np
+
+def build_rank_orders(cube):
+    """
+    Precomputes, for every metric in a {metric: (countries x years)} cube,
+    the ascending argsort of each year slice, its inverse permutation and the
+    sorted values themselves (for tie-aware ranks). Missing values (NaN) sort to the end and are excluded via `counts`.
+    """
+    orders = {}
+    for metric, values in cube.items():
+        by_year = values.T
+        # int32 indexes: half the size of argsort's int64, ample for any country count
+        order = np.argsort(by_year, axis=1, kind='stable').astype(np.int32)
+        positions = np.empty_like(order)
+        np.put_along_axis(positions, order, np.broadcast_to(np.arange(order.shape[1], dtype=np.int32), order.shape), axis=1)
+        orders[metric] = {
+            "order": order,
+            "positions": positions,
+            "sorted": np.take_along_axis(by_year, order, axis=1),
+            "counts": np.count_nonzero(~np.isnan(by_year), axis=1)
+        }
+    return orders
+
+def top_k(entry, year_idx, k, descending=True, allowed=None):
+    """
+    Returns up to k country indexes for one year, best first. Without a filter
+    this is a slice of the precomputed order; with an `allowed` boolean mask
+    it walks the order only until k matches are found.
+    """
+    order = entry["order"][year_idx, :entry["counts"][year_idx]]
+    if descending:
+        order = order[::-1]
+    if allowed is None:
+        return order[:k]
+
+    picked = []
+    for idx in order:
+        if allowed[idx]:
+            picked.append(idx)
+            if len(picked) == k:
+                break
+    return np.asarray(picked, dtype=order.dtype)
+
+def rank_of(entry, year_idx, country_idx, descending=True):
+    """
+    Returns (rank, percentile, count) for one country without sorting.
+    Tied values share the best rank, and percentile is the share of other
+    countries with a strictly lower value; both are two binary searches
+    over the year's sorted values.
+    """
+    count = int(entry["counts"][year_idx])
+    pos = int(entry["positions"][year_idx, country_idx])
+    if pos >= count:
+        return None
+    values = entry["sorted"][year_idx, :count]
+    value = values[pos]
+    below = int(np.searchsorted(values, value, side='left'))
+    if descending:
+        rank = count - int(np.searchsorted(values, value, side='right')) + 1
+    else:
+        rank = below + 1
+    percentile = 100.0 * below / (count - 1) if count > 1 else 100.0
+    return rank, percentile, count
@@ -0,0 +1,59 @@
+import numpy as np
+
+MIX_FEATURES = [
+    "coal_pct", "oil_pct", "gas_pct", "nuclear_pct",
+    "hydro_pct", "wind_pct", "solar_pct", "other_renewables_pct"
+]
+# Optional extras, keyed by the name used in the `features` query parameter
+EXTRA_FEATURES = {
+    "generation": "total_generation_twh",
+    "co2_per_kwh": "co2_per_kwh",
+}
+
+def build_feature_matrix(cube):
+    """
+    Stacks the mix shares and optional extras into one standardized
+    (years x countries x features) array. Generation is log-scaled first so
+    a handful of giant grids do not dominate the distance.
+    """
+    names = MIX_FEATURES + list(EXTRA_FEATURES)
+    columns = []
+    for name in names:
+        values = cube[EXTRA_FEATURES.get(name, name)]
+        if name == "generation":
+            values = np.log1p(values)
+        columns.append(values.T)
+    matrix = np.stack(columns, axis=-1)
+
+    mean = np.nanmean(matrix, axis=(0, 1))
+    std = np.nanstd(matrix, axis=(0, 1))
+    std[std == 0] = 1.0
+    return {"names": names, "matrix": (matrix - mean) / std}
+
+def feature_columns(features, names):
+    """Column indexes for the mix plus any requested extras."""
+    columns = list(range(len(MIX_FEATURES)))
+    for extra in features:
+        if extra not in EXTRA_FEATURES:
+            raise ValueError(f"Unknown feature '{extra}'. Choose from: {', '.join(EXTRA_FEATURES)}")
+        columns.append(names.index(extra))
+    return columns
+
+def nearest(features, query, candidates, k, exclude=None):
+    """
+    Returns (indexes, distances) of the k rows of `candidates` closest to
+    `query` in Euclidean distance. All distances come from one vectorized
+    pass; argpartition keeps selection linear in the number of candidates.
+    """
+    diff = candidates[:, features] - query[features]
+    distances = np.sqrt(np.einsum('ij,ij->i', diff, diff))
+    distances[np.isnan(distances)] = np.inf
+    if exclude is not None:
+        distances[exclude] = np.inf
+
+    k = min(k, int(np.isfinite(distances).sum()))
+    if k <= 0:
+        return np.array([], dtype=int), np.array([])
+    picked = np.argpartition(distances, k - 1)[:k]
+    picked = picked[np.argsort(distances[picked], kind='stable')]
+    return picked, distances[picked]
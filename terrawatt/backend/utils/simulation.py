@@ -0,0 +1,166 @@
+import math
+import threading
+import time
+import uuid
+
+# Emissions factors (g CO2/kWh) - approximate
+EMISSIONS_FACTORS = {
+    "coal_pct": 820,
+    "oil_pct": 720,
+    "gas_pct": 490,
+    "nuclear_pct": 12,
+    "hydro_pct": 24,
+    "wind_pct": 11,
+    "solar_pct": 45,
+    "other_renewables_pct": 38
+}
+
+SESSION_TTL_SECONDS = 15 * 60
+MAX_SESSIONS = 500
+
+def build_result(country_code, base_year, original_energy, original_emissions, simulated_mix, weighted_sum, total_pct):
+    """
+    Shapes a simulation response from a simulated mix and its running
+    sum(pct * factor) and sum(pct) over EMISSIONS_FACTORS.
+    """
+    if total_pct > 0:
+        new_co2_per_kwh = weighted_sum / total_pct
+    else:
+        new_co2_per_kwh = 0
+
+    # We keep total_generation_twh constant (assumption: demand doesn't change, just mix).
+    total_gen_twh = original_energy['total_generation_twh']
+    new_emissions_mt = (total_gen_twh * 1e9 * new_co2_per_kwh) / 1e12
+
+    return {
+        "country_code": country_code,
+        "base_year": base_year,
+        "original": {
+            "co2_emissions_mt": original_emissions['co2_emissions_mt'],
+            "co2_per_kwh": original_emissions['co2_per_kwh'],
+            "energy_mix": {k: original_energy[k] for k in EMISSIONS_FACTORS.keys()}
+        },
+        "simulated": {
+            "co2_emissions_mt": round(new_emissions_mt, 2),
+            "co2_per_kwh": round(new_co2_per_kwh, 2),
+            "energy_mix": {k: simulated_mix[k] for k in EMISSIONS_FACTORS.keys()}
+        },
+        "delta": {
+            "co2_saved_mt": round(original_emissions['co2_emissions_mt'] - new_emissions_mt, 2),
+            "co2_per_kwh_reduction": round(original_emissions['co2_per_kwh'] - new_co2_per_kwh, 2)
+        }
+    }
+
+def _finite(value):
+    # json.loads accepts NaN/Infinity, which would poison the running sums for good
+    value = float(value)
+    if not math.isfinite(value):
+        raise ValueError("Slider values must be finite numbers")
+    return value
+
+def _clamp_pct(value):
+    return min(max(value, 0), 100)
+
+class SimulationSession:
+    """
+    Pins one country's base energy and emissions rows and keeps the running
+    weighted sums, so each slider move only touches the sources it changes.
+    Listeners wait on `changed` and always read the latest version, which
+    coalesces bursts of updates into a single push.
+    """
+
+    def __init__(self, country_code, base_year, original_energy, original_emissions):
+        self.id = uuid.uuid4().hex
+        self.country_code = country_code
+        self.base_year = base_year
+        self.original_energy = original_energy
+        self.original_emissions = original_emissions
+        self.mix = {k: original_energy[k] for k in EMISSIONS_FACTORS}
+        self.weighted_sum = sum(self.mix[k] * f for k, f in EMISSIONS_FACTORS.items())
+        self.total_pct = sum(self.mix.values())
+        self.version = 0
+        self.closed = False
+        self.touched = time.monotonic()
+        self.changed = threading.Condition()
+
+    def update(self, set_values=None, adjust=None):
+        """Applies absolute slider values and/or deltas; returns the new version."""
+        set_values, adjust = set_values or {}, adjust or {}
+        if not isinstance(set_values, dict) or not isinstance(adjust, dict):
+            raise ValueError("set and adjust must be objects of source -> pct")
+        unknown = [source for source in [*set_values, *adjust] if source not in self.mix]
+        if unknown:
+            raise ValueError(f"Unknown source(s): {', '.join(unknown)}")
+        set_values = {source: _finite(value) for source, value in set_values.items()}
+        adjust = {source: _finite(delta) for source, delta in adjust.items()}
+
+        with self.changed:
+            for source, value in set_values.items():
+                self._move(source, value)
+            for source, delta in adjust.items():
+                self._move(source, self.mix[source] + delta)
+            self.version += 1
+            self.touched = time.monotonic()
+            self.changed.notify_all()
+            return self.version
+
+    def _move(self, source, value):
+        new = _clamp_pct(value)
+        old = self.mix[source]
+        self.weighted_sum += (new - old) * EMISSIONS_FACTORS[source]
+        self.total_pct += new - old
+        self.mix[source] = new
+
+    def snapshot(self):
+        with self.changed:
+            result = build_result(
+                self.country_code, self.base_year, self.original_energy, self.original_emissions,
+                self.mix, self.weighted_sum, self.total_pct
+            )
+            result["session_id"] = self.id
+            result["version"] = self.version
+            return result
+
+    def wait_for_change(self, seen_version, timeout):
+        """Blocks until a version newer than `seen_version` exists, or timeout."""
+        with self.changed:
+            self.changed.wait_for(lambda: self.version > seen_version or self.closed, timeout)
+            return self.version
+
+    def close(self):
+        with self.changed:
+            self.closed = True
+            self.changed.notify_all()
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+def _evict_expired(now):
+    expired = [sid for sid, s in _sessions.items() if now - s.touched > SESSION_TTL_SECONDS]
+    for sid in expired:
+        _sessions.pop(sid).close()
+
+def create_session(country_code, base_year, original_energy, original_emissions):
+    session = SimulationSession(country_code, base_year, original_energy, original_emissions)
+    with _sessions_lock:
+        _evict_expired(time.monotonic())
+        if len(_sessions) >= MAX_SESSIONS:
+            # Drop the least recently used session to stay bounded
+            oldest = min(_sessions.values(), key=lambda s: s.touched)
+            _sessions.pop(oldest.id).close()
+        _sessions[session.id] = session
+    return session
+
+def get_session(session_id):
+    with _sessions_lock:
+        session = _sessions.get(session_id)
+    if session is not None:
+        session.touched = time.monotonic()
+    return session
+
+def close_session(session_id):
+    with _sessions_lock:
+        session = _sessions.pop(session_id, None)
+    if session is not None:
+        session.close()
+    return session is not None
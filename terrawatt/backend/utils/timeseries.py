@@ -0,0 +1,146 @@
+import os
+from datetime import datetime, timezone
+import numpy as np
+
+# Sub-annual series live under data/series, partitioned by resolution,
+# country and calendar year (UTC):
+#   series/<resolution>/<country_code>/<year>/time.npy    int64 epoch seconds, sorted
+#   series/<resolution>/<country_code>/<year>/<metric>.npy float32, same length
+# Partitions are memory-mapped on demand, so tens of millions of rows on disk
+# cost only the pages a query touches. Annual data comes from the in-memory cube.
+ANNUAL = 'annual'
+RESOLUTIONS = (ANNUAL, 'monthly', 'hourly')
+TIME_COLUMN = 'time'
+
+def year_start(year):
+    return int(datetime(int(year), 1, 1, tzinfo=timezone.utc).timestamp())
+
+def parse_time(value, end=False):
+    """
+    Epoch seconds for 'YYYY', 'YYYY-MM' or any ISO date/datetime (UTC unless
+    an offset is given). With end=True a year or month means its last second.
+    """
+    text = str(value).strip()
+    try:
+        if len(text) == 4 and text.isdigit():
+            return year_start(int(text) + 1) - 1 if end else year_start(text)
+        if len(text) == 7 and text[4] == '-':
+            year, month = int(text[:4]), int(text[5:])
+            if end:
+                year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+                return int(datetime(year, month, 1, tzinfo=timezone.utc).timestamp()) - 1
+            return int(datetime(year, month, 1, tzinfo=timezone.utc).timestamp())
+        moment = datetime.fromisoformat(text)
+    except ValueError:
+        raise ValueError(f"Invalid time '{value}'; use YYYY, YYYY-MM or an ISO date")
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+def _utc_year(seconds):
+    return datetime.fromtimestamp(int(seconds), tz=timezone.utc).year
+
+def _open_column(path):
+    # Not cached: every open memmap pins a file descriptor. read() copies the
+    # slice it needs, so the map is released as soon as the request ends.
+    return np.load(path, mmap_mode='r')
+
+class SeriesStore:
+    """
+    Range reads over time-partitioned series. Only the partitions whose year
+    overlaps the requested range are opened, and only the boundary partitions
+    are cut with a binary search on their sorted time column.
+    """
+
+    def __init__(self, root, codes, years, cube):
+        self.root = root
+        self.code_pos = {code: i for i, code in enumerate(codes)}
+        self.annual_time = np.array([year_start(y) for y in years], dtype=np.int64)
+        self.cube = cube
+        self.partitions = self._scan()
+
+    def _scan(self):
+        partitions = {}
+        for resolution in RESOLUTIONS[1:]:
+            base = os.path.join(self.root, resolution)
+            if not os.path.isdir(base):
+                continue
+            partitions[resolution] = {
+                code: sorted(int(y) for y in os.listdir(os.path.join(base, code)) if y.isdigit())
+                for code in sorted(os.listdir(base))
+                if os.path.isdir(os.path.join(base, code))
+            }
+        return partitions
+
+    def resolutions(self, country_code):
+        found = [ANNUAL] if country_code in self.code_pos else []
+        return found + [r for r in RESOLUTIONS[1:] if self.partitions.get(r, {}).get(country_code)]
+
+    def read(self, country_code, metric, resolution=ANNUAL, start=None, end=None):
+        """Returns (time, values) for start <= time <= end, both bounds optional."""
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"resolution must be one of: {', '.join(RESOLUTIONS)}")
+        if start is not None and end is not None and start > end:
+            raise ValueError("start must not be after end")
+        if resolution == ANNUAL:
+            return self._read_annual(country_code, metric, start, end)
+
+        years = self.partitions.get(resolution, {}).get(country_code)
+        if not years:
+            raise ValueError(f"No {resolution} data for '{country_code}'")
+        lo_year = _utc_year(start) if start is not None else years[0]
+        hi_year = _utc_year(end) if end is not None else years[-1]
+
+        times, values = [], []
+        for year in years:
+            if year < lo_year or year > hi_year:
+                continue
+            folder = os.path.join(self.root, resolution, country_code, str(year))
+            path = os.path.join(folder, f"{metric}.npy")
+            if not os.path.exists(path):
+                raise ValueError(f"No {resolution} '{metric}' data for '{country_code}'")
+            t = _open_column(os.path.join(folder, f"{TIME_COLUMN}.npy"))
+            v = _open_column(path)
+            i = int(np.searchsorted(t, start, side='left')) if start is not None and year == lo_year else 0
+            j = int(np.searchsorted(t, end, side='right')) if end is not None and year == hi_year else len(t)
+            times.append(t[i:j])
+            values.append(v[i:j])
+        if not times:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.float32)
+        return np.concatenate(times), np.concatenate(values)
+
+    def _read_annual(self, country_code, metric, start, end):
+        if country_code not in self.code_pos:
+            raise ValueError(f"Unknown country '{country_code}'")
+        if metric not in self.cube:
+            raise ValueError(f"Unknown metric '{metric}'. Choose from: {', '.join(self.cube)}")
+        t = self.annual_time
+        i = int(np.searchsorted(t, start, side='left')) if start is not None else 0
+        j = int(np.searchsorted(t, end, side='right')) if end is not None else len(t)
+        return t[i:j], self.cube[metric][self.code_pos[country_code], i:j]
+
+def write_partitions(root, resolution, country_code, time, columns):
+    """
+    Splits one country's series into per-year partitions and writes them in
+    the layout SeriesStore reads. `time` is epoch seconds; `columns` maps
+    metric -> values of the same length.
+    """
+    if resolution == ANNUAL or resolution not in RESOLUTIONS:
+        raise ValueError(f"resolution must be one of: {', '.join(RESOLUTIONS[1:])}")
+    time = np.asarray(time, dtype=np.int64)
+    order = np.argsort(time, kind='stable')
+    time = time[order]
+    columns = {metric: np.asarray(values, dtype=np.float32)[order] for metric, values in columns.items()}
+    if len(time) == 0:
+        return
+    first, last = _utc_year(time[0]), _utc_year(time[-1])
+    cuts = np.searchsorted(time, [year_start(y) for y in range(first, last + 2)])
+    for k, year in enumerate(range(first, last + 1)):
+        lo, hi = cuts[k], cuts[k + 1]
+        if lo == hi:
+            continue
+        folder = os.path.join(root, resolution, country_code, str(year))
+        os.makedirs(folder, exist_ok=True)
+        np.save(os.path.join(folder, f"{TIME_COLUMN}.npy"), time[lo:hi])
+        for metric, values in columns.items():
+            np.save(os.path.join(folder, f"{metric}.npy"), values[lo:hi])
@@ -0,0 +1,165 @@
+import numpy as np
+from utils.simulation import EMISSIONS_FACTORS
+from utils.columns import column_values
+
+MIX_COLS = list(EMISSIONS_FACTORS.keys())
+NON_NEGATIVE_COLS = MIX_COLS + ["total_generation_twh", "battery_storage_mwh", "pumped_hydro_mwh"]
+
+# Tolerances match what the generator in scripts/smooth_data.py can produce
+# after rounding every stored value to 2 decimals.
+NEGATIVE_TOLERANCE = 0.01
+MIX_SUM_TOLERANCE = 0.15
+CO2_PER_KWH_TOLERANCE = 0.02
+CO2_MT_TOLERANCE = 0.02
+VOLATILITY_RATIO = 0.1
+VOLATILITY_MIN_MEAN = 0.1
+MAX_EXAMPLES = 5
+
+class DatasetValidationError(ValueError):
+    def __init__(self, report):
+        failed = [name for name, check in report["checks"].items() if not check["ok"] and check["severity"] == "error"]
+        super().__init__(f"Dataset failed validation: {', '.join(failed)}")
+        self.report = report
+
+def _column(table, name):
+    return np.asarray(column_values(table, name))
+
+def _check(severity, bad, table, values=None, detail=None):
+    """Summarizes a boolean row mask into a report entry with a few examples."""
+    failing = np.flatnonzero(bad)
+    codes = _column(table, 'country_code')
+    years = _column(table, 'year')
+    examples = []
+    for i in failing[:MAX_EXAMPLES]:
+        example = {"country_code": str(codes[i]), "year": int(years[i])}
+        if values is not None:
+            example["value"] = round(float(values[i]), 4)
+        examples.append(example)
+    entry = {"ok": len(failing) == 0, "severity": severity, "failures": int(len(failing)), "examples": examples}
+    if detail:
+        entry.update(detail)
+    return entry
+
+def _group_starts(codes):
+    """Boolean mask marking the first row of each country in code-sorted rows."""
+    starts = np.ones(len(codes), dtype=bool)
+    starts[1:] = codes[1:] != codes[:-1]
+    return starts
+
+def check_keys(energy, emissions):
+    codes = _column(energy, 'country_code').astype(str)
+    years = _column(energy, 'year')
+    em_codes = _column(emissions, 'country_code').astype(str)
+    em_years = _column(emissions, 'year')
+
+    # predict_trends and the simulator pair rows by position, so both files need identical keys
+    if len(codes) == len(em_codes):
+        misaligned = (codes != em_codes) | (years != em_years)
+    else:
+        misaligned = np.ones(max(len(codes), len(em_codes)), dtype=bool)
+        misaligned[:min(len(codes), len(em_codes))] = False
+    aligned_table = energy if len(codes) >= len(em_codes) else emissions
+
+    duplicate = np.zeros(len(codes), dtype=bool)
+    duplicate[1:] = (codes[1:] == codes[:-1]) & (years[1:] == years[:-1])
+
+    n_countries = len(np.unique(codes))
+    n_years = len(np.unique(years))
+    return {
+        "alignment": _check("error", misaligned, aligned_table,
+                            detail={"energy_rows": int(len(codes)), "emissions_rows": int(len(em_codes))}),
+        "duplicates": _check("error", duplicate, energy),
+        "completeness": {
+            "ok": len(codes) == n_countries * n_years,
+            "severity": "warning",
+            "failures": int(n_countries * n_years - len(codes)),
+            "examples": [],
+            "countries": int(n_countries),
+            "years": int(n_years)
+        }
+    }
+
+def check_values(energy):
+    mix = np.column_stack([_column(energy, c).astype(float) for c in MIX_COLS])
+    checks = {}
+
+    values = np.column_stack([_column(energy, c).astype(float) for c in NON_NEGATIVE_COLS])
+    negative = values < -NEGATIVE_TOLERANCE
+    checks["negatives"] = _check("error", negative.any(axis=1), energy, values.min(axis=1),
+                                 detail={"columns": [c for c, bad in zip(NON_NEGATIVE_COLS, negative.any(axis=0)) if bad]})
+
+    mix_sum = mix.sum(axis=1)
+    checks["mix_sum"] = _check("error", np.abs(mix_sum - 100) > MIX_SUM_TOLERANCE, energy, mix_sum)
+    return checks
+
+def check_volatility(energy):
+    """
+    Flags countries whose year-over-year generation changes are noisy
+    relative to their size, using bincount sums over the whole table.
+    """
+    codes = _column(energy, 'country_code').astype(str)
+    gen = _column(energy, 'total_generation_twh').astype(float)
+    starts = _group_starts(codes)
+    group = np.cumsum(starts) - 1
+    n_groups = int(group[-1]) + 1 if len(group) else 0
+
+    counts = np.bincount(group, minlength=n_groups)
+    means = np.bincount(group, weights=gen, minlength=n_groups) / np.maximum(counts, 1)
+
+    # Diffs within a country only: drop the diff that crosses into the next country
+    diffs = np.diff(gen)
+    within = ~starts[1:]
+    diff_group = group[1:][within]
+    diffs = diffs[within]
+    n_diffs = np.bincount(diff_group, minlength=n_groups)
+    diff_sum = np.bincount(diff_group, weights=diffs, minlength=n_groups)
+    diff_sq = np.bincount(diff_group, weights=diffs * diffs, minlength=n_groups)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        diff_mean = diff_sum / n_diffs
+        diff_std = np.sqrt(np.maximum(diff_sq / n_diffs - diff_mean ** 2, 0))
+
+    volatile = (means >= VOLATILITY_MIN_MEAN) & (n_diffs > 0) & (diff_std > means * VOLATILITY_RATIO)
+    first_rows = np.flatnonzero(starts)
+    bad_rows = np.zeros(len(codes), dtype=bool)
+    bad_rows[first_rows[volatile]] = True
+    ratio = np.zeros(len(codes))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ratio[first_rows] = np.nan_to_num(diff_std / means)
+    return {"volatility": _check("warning", bad_rows, energy, ratio)}
+
+def check_emissions(energy, emissions):
+    """Recomputes co2_per_kwh and co2_emissions_mt from the mix and EMISSIONS_FACTORS."""
+    factors = np.array([EMISSIONS_FACTORS[c] for c in MIX_COLS], dtype=float)
+    mix = np.column_stack([_column(energy, c).astype(float) for c in MIX_COLS])
+    expected_per_kwh = mix @ factors / 100.0
+    expected_mt = _column(energy, 'total_generation_twh').astype(float) * expected_per_kwh / 1000.0
+
+    per_kwh_error = np.abs(_column(emissions, 'co2_per_kwh').astype(float) - expected_per_kwh)
+    mt_error = np.abs(_column(emissions, 'co2_emissions_mt').astype(float) - expected_mt)
+    return {
+        "co2_per_kwh": _check("error", per_kwh_error > CO2_PER_KWH_TOLERANCE, emissions, per_kwh_error),
+        "co2_emissions_mt": _check("error", mt_error > CO2_MT_TOLERANCE, emissions, mt_error)
+    }
+
+def validate_tables(energy, emissions):
+    """
+    Runs every check over column arrays sorted by (country_code, year) and
+    returns a JSON-serializable report. `energy` and `emissions` can be the
+    loader's column tables or pandas DataFrames.
+    """
+    checks = check_keys(energy, emissions)
+    checks.update(check_values(energy))
+    checks.update(check_volatility(energy))
+    # Row-wise recomputation is only meaningful when both files line up
+    if checks["alignment"]["ok"]:
+        checks.update(check_emissions(energy, emissions))
+
+    errors = [name for name, c in checks.items() if not c["ok"] and c["severity"] == "error"]
+    warnings = [name for name, c in checks.items() if not c["ok"] and c["severity"] == "warning"]
+    return {
+        "ok": not errors,
+        "errors": errors,
+        "warnings": warnings,
+        "rows": int(len(_column(energy, 'year'))),
+        "checks": checks
+    }
@@ -1,5 +1,8 @@
+"use client";
+import { useState, useEffect } from 'react';
 import Link from 'next/link';
 import { CountryProfile } from '@/types';
+import { fetchCountryRanks, CountryRank } from '@/lib/api';
 
 interface CountryCardProps {
   country: CountryProfile;
@@ -7,6 +10,16 @@ interface CountryCardProps {
 }
 
 export default function CountryCard({ country, keyStat }: CountryCardProps) {
+  const [renewableRank, setRenewableRank] = useState<CountryRank | null>(null);
+
+  useEffect(() => {
+    let active = true;
+    fetchCountryRanks(country.code, 2024, ["renewable_pct"]).then((ranks) => {
+      if (active) setRenewableRank(ranks.renewable_pct ?? null);
+    });
+    return () => { active = false; };
+  }, [country.code]);
+
   return (
     <Link href={`/country/${country.code}`} className="block group">
       <div className="bg-slate-800/70 border border-slate-700 rounded-xl p-6 hover:border-green-500 transition-all duration-300 hover:shadow-lg hover:shadow-green-900/20 hover:-translate-y-1 h-full flex flex-col">
@@ -22,6 +35,11 @@ export default function CountryCard({ country, keyStat }: CountryCardProps) {
         <div className="bg-slate-900/50 rounded-lg p-3 border border-slate-700/50 mt-auto">
           <p className="text-xs text-slate-500 uppercase tracking-wider mb-1">2024 Snapshot</p>
           <p className="font-semibold text-green-400 text-sm">{keyStat}</p>
+          {renewableRank && (
+            <p className="text-xs text-slate-400 mt-1">
+              #{renewableRank.rank} of {renewableRank.of} for renewables &middot; {renewableRank.percentile}th percentile
+            </p>
+          )}
         </div>
         <div className="mt-4 flex items-center text-sm text-slate-500 group-hover:text-green-400 transition-colors">
           <span>View profile</span>
@@ -1,6 +1,6 @@
 "use client";
-import React, { useState, useEffect } from 'react';
-import { simulate, fetchEnergyMix } from '@/lib/api';
+import React, { useState, useEffect, useRef } from 'react';
+import { simulate, fetchEnergyMix, openSimulationSession, updateSimulationSession, simulationStreamUrl, closeSimulationSession } from '@/lib/api';
 import { SimulationResult } from '@/types';
 import { BarChart, Bar, XAxis, YAxis, Tooltip, Legend, ResponsiveContainer, Cell, CartesianGrid } from 'recharts';
 
@@ -31,21 +31,86 @@ export default function GridSimulator() {
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState("");
 
+  // Live session state: slider moves are batched and sent as incremental updates
+  const sessionRef = useRef<string | null>(null);
+  const streamingRef = useRef(false);
+  const pendingRef = useRef<Record<string, number>>({});
+  const inFlightRef = useRef(false);
+
   useEffect(() => {
-    fetchEnergyMix(country, 2024, 2024).then(data => {
-      if (data && data.length > 0) {
-        const latest = data[0];
-        const newMix: Record<string, number> = {};
-        SOURCES.forEach(k => newMix[k] = (latest as any)[k]);
-        setMix(newMix);
-        setBaseMix(newMix);
-        setResult(null);
+    let active = true;
+    let stream: EventSource | null = null;
+    let sessionId: string | null = null;
+    pendingRef.current = {};
+
+    const applyBaseline = (baseline: Record<string, number>) => {
+      const newMix: Record<string, number> = {};
+      SOURCES.forEach(k => newMix[k] = baseline[k]);
+      setMix(newMix);
+      setBaseMix(newMix);
+      setResult(null);
+    };
+
+    openSimulationSession(country, 2024).then(session => {
+      if (!active) {
+        if (session.session_id) closeSimulationSession(session.session_id);
+        return;
+      }
+      sessionId = session.session_id ?? null;
+      sessionRef.current = sessionId;
+      applyBaseline(session.original.energy_mix);
+
+      if (sessionId && typeof EventSource !== "undefined") {
+        stream = new EventSource(simulationStreamUrl(sessionId));
+        stream.addEventListener("open", () => { streamingRef.current = true; });
+        stream.addEventListener("result", (event) => {
+          const res: SimulationResult = JSON.parse((event as MessageEvent).data);
+          if (active && (res.version ?? 0) > 0) setResult(res);
+        });
+        // Without a stream, updates ask for the result inline instead
+        stream.onerror = () => { streamingRef.current = false; stream?.close(); };
       }
+    }).catch(() => {
+      // Sessions unavailable: fall back to the one-shot endpoints
+      sessionRef.current = null;
+      fetchEnergyMix(country, 2024, 2024).then(data => {
+        if (active && data && data.length > 0) {
+          applyBaseline(data[0] as unknown as Record<string, number>);
+        }
+      });
     });
+
+    return () => {
+      active = false;
+      stream?.close();
+      streamingRef.current = false;
+      sessionRef.current = null;
+      if (sessionId) closeSimulationSession(sessionId);
+    };
   }, [country]);
 
+  const flushUpdates = async () => {
+    const sessionId = sessionRef.current;
+    if (!sessionId || inFlightRef.current || Object.keys(pendingRef.current).length === 0) return;
+    // One request in flight at a time; moves made meanwhile are merged into the next batch
+    const batch = pendingRef.current;
+    pendingRef.current = {};
+    inFlightRef.current = true;
+    try {
+      const res = await updateSimulationSession(sessionId, batch, !streamingRef.current);
+      if (res && sessionRef.current === sessionId) setResult(res);
+    } catch {
+      setError("Live update failed. Use Run Simulation instead.");
+    } finally {
+      inFlightRef.current = false;
+      flushUpdates();
+    }
+  };
+
   const handleSliderChange = (source: string, val: number) => {
     setMix(prev => ({ ...prev, [source]: val }));
+    pendingRef.current[source] = val;
+    flushUpdates();
   };
 
   const total = Object.values(mix).reduce((a, b) => a + b, 0);
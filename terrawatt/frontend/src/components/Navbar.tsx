@@ -2,6 +2,8 @@
 import { useState, useEffect, useRef } from 'react';
 import Link from 'next/link';
 import { usePathname, useRouter } from 'next/navigation';
+import { searchCountries } from '@/lib/api';
+import { CountryRecord } from '@/types';
 
 const COUNTRIES = [
   { code: "FRA", name: "France", flag: "\u{1F1EB}\u{1F1F7}" },
@@ -12,27 +14,6 @@ const COUNTRIES = [
   { code: "ISL", name: "Iceland", flag: "\u{1F1EE}\u{1F1F8}" },
 ];
 
-// Simple mapping for search (can be expanded)
-const SEARCH_DATA = [
-    { code: "AFG", name: "Afghanistan" }, { code: "ALB", name: "Albania" }, { code: "DZA", name: "Algeria" },
-    { code: "ARG", name: "Argentina" }, { code: "AUS", name: "Australia" }, { code: "AUT", name: "Austria" },
-    { code: "BGD", name: "Bangladesh" }, { code: "BEL", name: "Belgium" }, { code: "BRA", name: "Brazil" },
-    { code: "CAN", name: "Canada" }, { code: "CHL", name: "Chile" }, { code: "CHN", name: "China" },
-    { code: "COL", name: "Colombia" }, { code: "DNK", name: "Denmark" }, { code: "EGY", name: "Egypt" },
-    { code: "FIN", name: "Finland" }, { code: "FRA", name: "France" }, { code: "GEO", name: "Georgia" },
-    { code: "DEU", name: "Germany" }, { code: "GRC", name: "Greece" }, { code: "IND", name: "India" },
-    { code: "IDN", name: "Indonesia" }, { code: "IRN", name: "Iran" }, { code: "IRL", name: "Ireland" },
-    { code: "ISR", name: "Israel" }, { code: "ITA", name: "Italy" }, { code: "JPN", name: "Japan" },
-    { code: "KAZ", name: "Kazakhstan" }, { code: "MEX", name: "Mexico" }, { code: "NLD", name: "Netherlands" },
-    { code: "NZL", name: "New Zealand" }, { code: "NOR", name: "Norway" }, { code: "PAK", name: "Pakistan" },
-    { code: "PHL", name: "Philippines" }, { code: "POL", name: "Poland" }, { code: "PRT", name: "Portugal" },
-    { code: "RUS", name: "Russia" }, { code: "SAU", name: "Saudi Arabia" }, { code: "ZAF", name: "South Africa" },
-    { code: "KOR", name: "South Korea" }, { code: "ESP", name: "Spain" }, { code: "SWE", name: "Sweden" },
-    { code: "CHE", name: "Switzerland" }, { code: "THA", name: "Thailand" }, { code: "TUR", name: "Turkey" },
-    { code: "UKR", name: "Ukraine" }, { code: "ARE", name: "United Arab Emirates" }, { code: "GBR", name: "United Kingdom" },
-    { code: "USA", name: "United States" }, { code: "VNM", name: "Vietnam" }
-];
-
 export default function Navbar() {
   const [mobileMenuOpen, setMobileMenuOpen] = useState(false);
   const [countriesOpen, setCountriesOpen] = useState(false);
@@ -47,9 +28,26 @@ export default function Navbar() {
   const linkClass = (path: string) =>
     `transition-colors ${isActive(path) ? 'text-green-400 font-semibold' : 'text-slate-300 hover:text-white'}`;
 
-  const filteredResults = searchQuery.length > 1 
-    ? SEARCH_DATA.filter(c => c.name.toLowerCase().includes(searchQuery.toLowerCase())).slice(0, 5)
-    : [];
+  const [filteredResults, setFilteredResults] = useState<CountryRecord[]>([]);
+
+  // Autocomplete from the backend country index; only countries with data are linkable
+  useEffect(() => {
+    if (searchQuery.length < 2) {
+      setFilteredResults([]);
+      return;
+    }
+    let active = true;
+    const timer = setTimeout(() => {
+      searchCountries(searchQuery, 10)
+        .then((results) => {
+          if (active) setFilteredResults(results.filter((r) => r.has_data).slice(0, 5));
+        })
+        .catch(() => {
+          if (active) setFilteredResults([]);
+        });
+    }, 150);
+    return () => { active = false; clearTimeout(timer); };
+  }, [searchQuery]);
 
   useEffect(() => {
     const handleClickOutside = (event: MouseEvent) => {
@@ -89,9 +87,9 @@ export default function Navbar() {
               <div className="absolute top-full left-0 right-0 mt-2 bg-slate-800 border border-slate-700 rounded-xl shadow-2xl py-2 overflow-hidden animate-in fade-in slide-in-from-top-2">
                 {filteredResults.map(res => (
                   <button
-                    key={res.code}
+                    key={res.iso3}
                     onClick={() => {
-                      router.push(`/country/${res.code}`);
+                      router.push(`/country/${res.iso3}`);
                       setSearchQuery("");
                       setIsSearchFocused(false);
                     }}
@@ -1,4 +1,4 @@
-import { SimulationRequest, SimulationResult, EnergyMix, Emissions } from "@/types";
+import { SimulationRequest, SimulationResult, EnergyMix, Emissions, CountryRecord } from "@/types";
 
 const IS_SERVER = typeof window === "undefined";
 const API_BASE = process.env.NEXT_PUBLIC_API_URL || (IS_SERVER ? "http://localhost:5001/api" : "/api");
@@ -13,18 +13,80 @@ export async function fetchEnergyMix(countryCode: string, startYear = 2000, endY
   }
 }
 
-export async function fetchRenewablePct(year: number): Promise<{ id: string; value: number }[]> {
-  const res = await fetch(`${API_BASE}/energy/renewable-pct?year=${year}`);
+export async function fetchRenewablePct(year: number, key: "code" | "numeric" = "code"): Promise<{ id: string; value: number }[]> {
+  const res = await fetch(`${API_BASE}/energy/renewable-pct?year=${year}&key=${key}`);
   if (!res.ok) throw new Error("Failed to fetch renewable pct");
   return res.json();
 }
 
+export interface DistributionSummary {
+  count: number;
+  min: number;
+  max: number;
+  mean: number;
+  quantiles: number[];
+  jenks: number[];
+  histogram: number[];
+}
+
+export interface MetricDistribution {
+  metric: string;
+  domain: [number, number];
+  histogram_edges: number[];
+  years: Record<string, DistributionSummary>;
+}
+
+// Omitting the year returns every year's summary for the animated map slider
+export async function fetchDistribution(metric: string): Promise<MetricDistribution | null> {
+  try {
+    const res = await fetch(`${API_BASE}/energy/distribution?metric=${metric}`);
+    if (!res.ok) return null;
+    return res.json();
+  } catch {
+    return null;
+  }
+}
+
+export async function fetchCountries(): Promise<CountryRecord[]> {
+  try {
+    const res = await fetch(`${API_BASE}/countries`);
+    if (!res.ok) return [];
+    return res.json();
+  } catch {
+    return [];
+  }
+}
+
+export async function searchCountries(query: string, limit = 10): Promise<CountryRecord[]> {
+  const res = await fetch(`${API_BASE}/countries/search?q=${encodeURIComponent(query)}&limit=${limit}`);
+  if (!res.ok) return [];
+  return res.json();
+}
+
 export async function fetchLeaderboards(year: number): Promise<any> {
   const res = await fetch(`${API_BASE}/energy/leaderboard?year=${year}`);
   if (!res.ok) return null;
   return res.json();
 }
 
+export interface CountryRank {
+  value: number;
+  rank: number;
+  of: number;
+  percentile: number;
+}
+
+export async function fetchCountryRanks(countryCode: string, year = 2024, metrics?: string[]): Promise<Record<string, CountryRank>> {
+  const metricsParam = metrics ? `&metrics=${metrics.join(",")}` : "";
+  try {
+    const res = await fetch(`${API_BASE}/energy/rank/country?country_code=${countryCode}&year=${year}${metricsParam}`);
+    if (!res.ok) return {};
+    return res.json();
+  } catch {
+    return {};
+  }
+}
+
 export async function fetchRegional(year: number): Promise<any[]> {
   const res = await fetch(`${API_BASE}/energy/regional?year=${year}`);
   if (!res.ok) return [];
@@ -75,4 +137,37 @@ export async function simulate(request: SimulationRequest): Promise<SimulationRe
   });
   if (!res.ok) throw new Error("Failed to simulate");
   return res.json();
-}
\ No newline at end of file
+}
+
+export async function openSimulationSession(countryCode: string, baseYear = 2024): Promise<SimulationResult> {
+  const res = await fetch(`${API_BASE}/simulate/session`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ country_code: countryCode, base_year: baseYear }),
+  });
+  if (!res.ok) throw new Error("Failed to open simulation session");
+  return res.json();
+}
+
+// With reply=false the server only acks and pushes the result over the stream
+export async function updateSimulationSession(sessionId: string, set: Record<string, number>, reply = true): Promise<SimulationResult | null> {
+  const res = await fetch(`${API_BASE}/simulate/session/${sessionId}`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ set, reply }),
+  });
+  if (!res.ok) throw new Error("Failed to update simulation session");
+  return reply ? res.json() : null;
+}
+
+export function simulationStreamUrl(sessionId: string): string {
+  return `${API_BASE}/simulate/session/${sessionId}/stream`;
+}
+
+export async function closeSimulationSession(sessionId: string): Promise<void> {
+  try {
+    await fetch(`${API_BASE}/simulate/session/${sessionId}`, { method: "DELETE" });
+  } catch {
+    // Session expires server-side anyway
+  }
+}
@@ -36,6 +36,8 @@ export interface SimulationResult {
   original: { co2_emissions_mt: number; co2_per_kwh: number; energy_mix: Record<string, number> };
   simulated: { co2_emissions_mt: number; co2_per_kwh: number; energy_mix: Record<string, number> };
   delta: { co2_saved_mt: number; co2_per_kwh_reduction: number };
+  session_id?: string;
+  version?: number;
 }
 
 export interface CountryProfile {
@@ -45,3 +47,11 @@ export interface CountryProfile {
   description: string;
   flagEmoji: string;
 }
+
+export interface CountryRecord {
+  iso_numeric: string;
+  iso3: string;
+  name: string;
+  has_data: boolean;
+  match?: "prefix" | "fuzzy";
+}